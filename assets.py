@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import posixpath
+import re
+import time
+
+from flask import request, url_for
+
+# Fingerprinted copies are written here, relative to the static folder
+DIST_DIR = 'dist'
+
+# Static files that are build outputs, never sources
+SKIP_SUFFIXES = ('.gz', '.br', '.tmp')
+
+# Precompressed copies written next to each file by compression.py
+PRECOMPRESSED_SUFFIXES = ('.gz', '.br')
+
+# Fingerprinted names of the current and the previous build, in static/dist/
+BUILDS_FILE = '.builds.json'
+
+# Temp files older than this are left over from a worker that died
+STALE_TMP_SECONDS = 3600
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# url(...) references in stylesheets, e.g. url(../webfonts/fa-solid-900.woff2)
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+
+# Logical asset name (e.g. 'css/marketplace.css') -> fingerprinted path
+manifest = {}
+
+# Hash of the whole manifest; changes whenever any asset changes
+digest = ''
+
+
+def init_app(app):
+    """Fingerprint every static asset and register the asset_url helper.
+
+    Each file under static/ is copied once to static/dist/ with a hash of
+    its content in the name, so its URL changes whenever the file does and
+    browsers can cache it forever.
+    """
+    global digest
+    static_folder = app.static_folder
+    sources = []
+    for root, dirs, files in os.walk(static_folder):
+        if os.path.abspath(root) == os.path.abspath(static_folder) and DIST_DIR in dirs:
+            dirs.remove(DIST_DIR)
+        for name in files:
+            if name.endswith(SKIP_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            sources.append(os.path.relpath(path, static_folder).replace(os.sep, '/'))
+
+    # Stylesheets go last so the fonts and images they reference already
+    # have fingerprinted names to point at
+    sources.sort(key=lambda logical: (logical.endswith('.css'), logical))
+    for logical in sources:
+        with open(os.path.join(static_folder, logical), 'rb') as f:
+            data = f.read()
+        if logical.endswith('.css'):
+            data = _rewrite_css_urls(logical, data)
+        manifest[logical] = _write_fingerprinted(static_folder, logical, data)
+
+    digest = hashlib.sha1(repr(sorted(manifest.items())).encode()).hexdigest()[:12]
+    _prune_dist(static_folder)
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.after_request(_cache_fingerprinted)
+
+
+def _write_fingerprinted(static_folder, logical, data):
+    base, ext = os.path.splitext(logical)
+    fingerprinted = f"{DIST_DIR}/{base}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+    target = os.path.join(static_folder, fingerprinted)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Every worker builds static/dist at startup; with a temp name per
+        # process none can move another's half-written copy, and the last
+        # rename wins with identical content
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, target)
+    return fingerprinted
+
+
+def _prune_dist(static_folder):
+    """Remove copies in static/dist/ that no recent build refers to.
+
+    The files of the previous build are kept too, so pages rendered by
+    workers still running it during a rolling restart keep their assets.
+    Nothing is removed until a builds file records which build came
+    before. Precompressed copies go with their file.
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+    builds_path = os.path.join(dist, BUILDS_FILE)
+    current = sorted(manifest.values())
+    try:
+        with open(builds_path) as f:
+            builds = json.load(f)
+    except (OSError, ValueError):
+        builds = None
+    if not isinstance(builds, list):
+        # Every worker runs this at startup: only prune once the builds
+        # file has recorded which build came before this one
+        _write_builds(builds_path, [current])
+        return
+    if not builds or builds[0] != current:
+        # The workers after the first find the current build already
+        # recorded and keep the same previous one
+        builds = [current] + builds[:1]
+        _write_builds(builds_path, builds)
+    keep = {path for build in builds for path in build}
+
+    stale = time.time() - STALE_TMP_SECONDS
+    for root, dirs, files in os.walk(dist, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            fingerprinted = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            if name.endswith(PRECOMPRESSED_SUFFIXES):
+                fingerprinted = os.path.splitext(fingerprinted)[0]
+            try:
+                # Another worker may be writing a temp file right now
+                if name.endswith('.tmp') and os.path.getmtime(path) > stale:
+                    continue
+                if fingerprinted in keep or fingerprinted == f'{DIST_DIR}/{BUILDS_FILE}':
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                # Renamed or pruned by another worker meanwhile
+                pass
+        if root != dist and not os.listdir(root):
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+
+
+def _write_builds(path, builds):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(builds, f)
+    os.replace(tmp, path)
+
+
+def _rewrite_css_urls(logical, data):
+    """Point relative url(...) references at the fingerprinted copies.
+
+    The stylesheet itself moves to static/dist/, so a reference such as
+    ../webfonts/fa-solid-900.woff2 would otherwise resolve to a file that
+    does not exist there.
+    """
+    source_dir = posixpath.dirname(logical)
+    dist_dir = posixpath.join(DIST_DIR, source_dir)
+
+    def replace(match):
+        url = match.group(2).strip()
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+        path = re.split(r'[?#]', url, 1)[0]
+        referenced = posixpath.normpath(posixpath.join(source_dir, path))
+        if referenced not in manifest:
+            return match.group(0)
+        return f"url({posixpath.relpath(manifest[referenced], dist_dir)}{url[len(path):]})"
+
+    return CSS_URL_RE.sub(replace, data.decode('utf-8')).encode('utf-8')
+
+
+def asset_url(name):
+    """URL of the fingerprinted copy of a static asset"""
+    return url_for('static', filename=manifest.get(name, name))
+
+
+def _cache_fingerprinted(response):
+    if request.endpoint == 'static' and response.status_code == 200:
+        filename = (request.view_args or {}).get('filename', '')
+        if filename.startswith(DIST_DIR + '/'):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -0,0 +1,47 @@
+"""Bytes transferred for repeated page views with and without conditional GET.
+
+Each page is requested `repeats` times. The plain run ignores ETags, as the
+routes did before; the conditional run sends back the last ETag it received
+in If-None-Match, as a browser or CDN would.
+
+    python benchmarks/bench_conditional_get.py [repeats]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import index
+
+PAGES = ['/marketplace', '/marketplace?category=Electronics', '/admin']
+
+
+def login(client):
+    client.post('/process_login', data={'username': 'administrator', 'password': 'c4ptain5ecur3'})
+
+
+def transfer(client, path, repeats, conditional):
+    total = 0
+    not_modified = 0
+    etag = None
+    for _ in range(repeats):
+        headers = {'If-None-Match': etag} if conditional and etag else {}
+        response = client.get(path, headers=headers)
+        total += len(response.get_data())
+        not_modified += response.status_code == 304
+        etag = response.headers.get('ETag', etag)
+    return total, not_modified
+
+
+def main(repeats=20):
+    client = index.app.test_client()
+    login(client)
+    print(f"{'page':<36}{'plain bytes':>14}{'conditional':>14}{'304s':>6}")
+    for path in PAGES:
+        plain, _ = transfer(client, path, repeats, conditional=False)
+        conditional, hits = transfer(client, path, repeats, conditional=True)
+        print(f"{path:<36}{plain:>14,}{conditional:>14,}{hits:>6}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
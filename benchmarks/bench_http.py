@@ -0,0 +1,388 @@
+"""Throughput, latency percentiles and memory per request for the main routes.
+
+Every route is driven twice: in-process through the Flask test client, and
+over HTTP against a real server (werkzeug's threaded WSGI server on a
+localhost port). Each scale runs in its own process against a copy of a
+database built by loadgen.py, so caches, pooled connections and the
+activity log never carry over between scales or runs. Results are written
+as JSON so runs on two commits can be compared:
+
+    python benchmarks/bench_http.py [--scales small,medium] [--requests 200] [--duration 5]
+        [--concurrency 1] [--output bench_http.json] [--compare previous.json]
+
+Built databases are kept in --workdir and reused; loadgen output depends
+only on the sizes and seed, and pending migrations are applied to the copy
+before measuring.
+
+Memory is measured through the test client in a separate, slower pass
+under tracemalloc: peak_kib is the most memory allocated at once while
+serving a request and retained_bytes what each request left allocated
+afterwards. It is not measured through the server, where the thread
+started for every connection would swamp it.
+"""
+import argparse
+import contextlib
+import datetime
+import http.client
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import loadgen
+import migrations
+
+# users, products, sales
+SCALES = {
+    'small': (1000, 100, 10000),
+    'medium': (100000, 10000, 1000000),
+    'large': (1000000, 100000, 10000000),
+}
+
+ADMIN = {'username': 'administrator', 'password': 'c4ptain5ecur3'}
+USER = {'username': 'user1', 'password': 'password123'}
+
+# Sent with every request, as a browser would
+HEADERS = {'Accept-Encoding': 'gzip, br'}
+
+_registrations = itertools.count()
+
+
+def registration():
+    """Form for a new user; names are unique within the run"""
+    username = f"bench{os.getpid()}-{next(_registrations)}"
+    return {'username': username, 'password': 'benchmark', 'confirm_password': 'benchmark'}
+
+
+# method, path, form (or a function returning one), log in as, expected status
+ROUTES = (
+    ('GET', '/', None, None, 200),
+    ('GET', '/marketplace', None, USER, 200),
+    ('GET', '/marketplace?category=Electronics', None, USER, 200),
+    ('POST', '/process_login', USER, None, 302),
+    ('POST', '/process_register', registration, None, 302),
+    ('GET', '/admin', None, ADMIN, 200),
+    ('GET', '/admin/logs', None, ADMIN, 200),
+    ('GET', '/admin/download_users', None, ADMIN, 200),
+)
+
+
+class AppClient:
+    """Requests through the Flask test client, without a socket"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None):
+        response = self.client.open(path, method=method, data=form, headers=HEADERS)
+        # Read streamed bodies a chunk at a time, as a server would send them
+        size = sum(len(chunk) for chunk in response.iter_encoded())
+        response.close()
+        return response.status_code, size
+
+    def close(self):
+        pass
+
+
+class HttpClient:
+    """Requests over HTTP, keeping cookies like a browser.
+
+    The development server closes the connection after every response, so
+    each request includes connecting, as it would for a client without
+    keep-alive.
+    """
+
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection('127.0.0.1', port)
+        self.cookies = {}
+
+    def request(self, method, path, form=None):
+        headers = dict(HEADERS)
+        body = None
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+        if form is not None:
+            body = urllib.parse.urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        size = 0
+        while chunk := response.read(65536):
+            size += len(chunk)
+        for header in response.headers.get_all('Set-Cookie') or ():
+            name, _, value = header.split(';', 1)[0].partition('=')
+            self.cookies[name.strip()] = value
+        return response.status, size
+
+    def close(self):
+        self.connection.close()
+
+
+@contextlib.contextmanager
+def running_server(app):
+    """Port of a threaded werkzeug server for `app`, stopped on exit"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class Handler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_port
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def call(client, route):
+    method, path, form, _, expected = route
+    if callable(form):
+        form = form()
+    status, size = client.request(method, path, form)
+    return status == expected, size
+
+
+def prepared_client(new_client, route, warmup):
+    client = new_client()
+    login = route[3]
+    if login:
+        client.request('POST', '/process_login', login)
+    for _ in range(warmup):
+        call(client, route)
+    return client
+
+
+def measure(new_client, route, requests, duration, concurrency, warmup):
+    """Time up to `requests` calls of `route`, shared between `concurrency`
+    clients, stopping early after `duration` seconds"""
+    clients = [prepared_client(new_client, route, warmup) for _ in range(concurrency)]
+    latencies = []
+    unexpected = []
+    sizes = []
+    issued = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    def run(client):
+        while next(issued) < requests and time.perf_counter() < deadline:
+            started = time.perf_counter()
+            ok, size = call(client, route)
+            latencies.append(time.perf_counter() - started)
+            sizes.append(size)
+            if not ok:
+                unexpected.append(1)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=run, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.close()
+
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        'requests': len(latencies),
+        'unexpected_status': len(unexpected),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'response_bytes': round(statistics.fmean(sizes)),
+    }
+
+
+def memory(new_client, route, samples):
+    """Peak and retained traced memory per call of `route`"""
+    client = prepared_client(new_client, route, 1)
+    peaks = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(samples):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call(client, route)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+        client.close()
+    return {
+        'peak_kib': round(statistics.median(peaks) / 1024, 1),
+        'retained_bytes': round(retained / samples),
+    }
+
+
+def run_scale(scale, database, args):
+    """Measure every route against a fresh copy of `database`; runs in the
+    per-scale child process and returns the results for that scale"""
+    workdir = os.path.join(args.workdir, scale)
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    os.makedirs(workdir)
+    shutil.copyfile(database, os.path.join(workdir, 'marketplace.db'))
+    # The app opens marketplace.db and writes logs/ relative to the
+    # working directory
+    os.chdir(workdir)
+    migrations.init_db('marketplace.db')
+
+    import index
+    app = index.app
+    results = {}
+    with running_server(app) as port:
+        clients = {
+            'test_client': lambda: AppClient(app),
+            'server': lambda: HttpClient(port),
+        }
+        for mode, new_client in clients.items():
+            results[mode] = {}
+            for route in ROUTES:
+                name = f"{route[0]} {route[1]}"
+                result = measure(new_client, route, args.requests, args.duration, args.concurrency, args.warmup)
+                if mode == 'test_client':
+                    result.update(memory(new_client, route, args.memory_samples))
+                results[mode][name] = result
+    index.activity_logger.close()
+    return results
+
+
+def database_path(scale, args):
+    return os.path.join(args.workdir, f"{scale}.db")
+
+
+def build_database(scale, args):
+    users, products, sales = SCALES[scale]
+    database = database_path(scale, args)
+    if args.rebuild or not os.path.exists(database):
+        os.makedirs(args.workdir, exist_ok=True)
+        loadgen.build(database, users, products, sales, args.seed)
+    return database
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(scale, results):
+    users, products, sales = SCALES[scale]
+    for mode, routes in results.items():
+        print(f"\n{scale} ({users:,} users, {products:,} products, {sales:,} sales) via {mode}")
+        print(f"{'route':<42}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+        for name, result in routes.items():
+            peak = f"{result['peak_kib']:.1f}" if 'peak_kib' in result else '-'
+            flag = '  unexpected status' if result['unexpected_status'] else ''
+            print(f"{name:<42}{result['throughput_rps']:>9.1f}{result['p50_ms']:>9.2f}"
+                  f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{peak:>10}{flag}")
+
+
+def compare(previous, current):
+    """Print p50 latency and throughput change against an earlier run"""
+    print(f"\nCompared with {previous.get('commit') or 'previous run'}")
+    print(f"{'scale / mode / route':<66}{'p50 ms':>16}{'req/s':>16}")
+    for scale, modes in current['results'].items():
+        for mode, routes in modes.items():
+            for name, result in routes.items():
+                before = previous.get('results', {}).get(scale, {}).get(mode, {}).get(name)
+                if not before:
+                    continue
+                print(f"{f'{scale} / {mode} / {name}':<66}"
+                      f"{before['p50_ms']:>7.2f} ->{result['p50_ms']:>7.2f}"
+                      f"{before['throughput_rps']:>7.0f} ->{result['throughput_rps']:>7.0f}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument('--requests', type=int, default=200, help="most requests per route and mode")
+    parser.add_argument('--duration', type=float, default=5.0, help="most seconds per route and mode")
+    parser.add_argument('--concurrency', type=int, default=1, help="clients sending requests at once")
+    parser.add_argument('--warmup', type=int, default=5, help="unmeasured requests per client first")
+    parser.add_argument('--memory-samples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'marketplace-bench'))
+    parser.add_argument('--rebuild', action='store_true', help="rebuild databases even if present")
+    parser.add_argument('--output', default='bench_http.json')
+    parser.add_argument('--compare', help="results file of an earlier run")
+    # Internal: measure one scale in this process and write its results
+    parser.add_argument('--run-scale', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.workdir = os.path.abspath(args.workdir)
+    args.output = os.path.abspath(args.output)
+    return args
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    if args.run_scale:
+        results = run_scale(args.run_scale, database_path(args.run_scale, args), args)
+        with open(args.output, 'w') as f:
+            json.dump(results, f)
+        return 0
+
+    scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        sys.exit(f"Unknown scale {', '.join(unknown)}; choose from {', '.join(SCALES)}")
+
+    output = {
+        'commit': git_commit(),
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'settings': {key: getattr(args, key) for key in ('requests', 'duration', 'concurrency', 'warmup', 'memory_samples', 'seed')},
+        'scales': {scale: dict(zip(('users', 'products', 'sales'), SCALES[scale])) for scale in scales},
+        'results': {},
+    }
+    for scale in scales:
+        build_database(scale, args)
+        part = os.path.join(args.workdir, f"{scale}-results.json")
+        # A fresh process per scale: the app's pools and caches are module
+        # state created at import
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *argv, '--run-scale', scale, '--output', part],
+            check=True
+        )
+        with open(part) as f:
+            output['results'][scale] = json.load(f)
+        report(scale, output['results'][scale])
+
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Request-thread cost of one log_activity call, before and after LogEvent.
+
+"before" is the ActivityLogger.log_activity that LogEvent replaced, copied
+unchanged: the timestamp formatted with strftime, the User-Agent read
+through request.headers and the CSV line built with f-strings and
+.replace(',', ';') on every call. "after" is the current log_activity,
+which captures a LogEvent. Both run inside a Flask request context with
+the write itself stubbed out; "formatted" adds the CSV formatting that a
+sink (or the buffered writer thread) now does.
+
+    python benchmarks/bench_logging.py [iterations]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask, request
+from logs import ActivityLogger, format_log_line
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'}
+
+
+class NullSink:
+    def write_entries(self, events):
+        pass
+
+
+class FormattingSink:
+    def write_entries(self, events):
+        for event in events:
+            format_log_line(event.to_row())
+
+
+def logger_with(sink):
+    logger = ActivityLogger()
+    logger._sink = sink
+    return logger
+
+
+class BaselineActivityLogger:
+    """log_activity as it was before LogEvent, with _write_log stubbed out"""
+
+    def _write_log(self, log_entry):
+        pass
+
+    def log_activity(self, activity_type, details, status='success', user_id=None, username=None, request=None, additional_info=None):
+        """Log general user activities"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        ip_address = request.remote_addr if request else 'N/A'
+        user_agent = request.headers.get('User-Agent') if request else 'N/A'
+
+        log_entry = (
+            f"{timestamp},{activity_type},{status},"
+            f"{username or 'N/A'},{user_id or 'N/A'},"
+            f"{ip_address},{user_agent.replace(',', ';') if user_agent else 'N/A'},"
+            f"{details.replace(',', ';') if details else 'N/A'}"
+        )
+
+        if additional_info:
+            log_entry += f",{str(additional_info).replace(',', ';')}"
+
+        self._write_log(log_entry)
+
+
+def time_per_call(func, iterations):
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main(iterations=100000):
+    app = Flask(__name__)
+    before = BaselineActivityLogger()
+    after = logger_with(NullSink())
+    formatted = logger_with(FormattingSink())
+    with app.test_request_context('/marketplace', headers=HEADERS, environ_base={'REMOTE_ADDR': '127.0.0.1'}):
+        results = {
+            'before': time_per_call(lambda: before.log_activity(
+                'access', 'Accessed marketplace', user_id=2, username='user1', request=request), iterations),
+            'after': time_per_call(lambda: after.log_activity(
+                'access', 'Accessed marketplace', user_id=2, username='user1', request=request), iterations),
+            'formatted': time_per_call(lambda: formatted.log_activity(
+                'access', 'Accessed marketplace', user_id=2, username='user1', request=request), iterations),
+        }
+    print(f"{'log_activity':<16}{'us/event':>10}")
+    for name, seconds in results.items():
+        print(f"{name:<16}{seconds * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
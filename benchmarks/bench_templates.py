@@ -0,0 +1,78 @@
+"""Per-render cost of each page template, before and after precompilation.
+
+"before" renders the template source with render_template_string, which is
+what the routes used to do; "after" renders the precompiled template by name.
+
+    python benchmarks/bench_templates.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import render_template, render_template_string
+import index
+import sample_data
+
+SAMPLE_CONTEXTS = {
+    'index.html': {},
+    'login.html': {'error': 'Invalid credentials! Please try again.'},
+    'register.html': {},
+    'marketplace.html': {
+        'product_grid': '',
+        'selected_category': 'Electronics',
+        'username': 'user1',
+    },
+    '_product_grid.html': {
+        'products': [(f"Product {i}", 'Sample product', 9.99 + i, 'Electronics', i) for i in range(1, 25)],
+        'selected_category': 'Electronics',
+        'next_after': 24,
+        'prev_before': None,
+        'page_size': 24,
+    },
+    'admin_logs.html': {
+        'log_entries': ['2025-05-18 14:16:36,login,success,administrator,1,127.0.0.1,N/A,User logged in successfully\n'] * 100,
+        'older_cursor': 1024,
+    },
+    'admin_dashboard.html': {
+        'users': sample_data.users(50),
+        'user_columns': ['id', 'username', 'email', 'created_at', 'last_login', 'status', 'role', 'phone', 'country'],
+        'total_sales_amount': 275700,
+        'total_sales_count': 158,
+        'total_products': 42,
+        'total_users': 50,
+        'monthly_sales': sample_data.monthly_sales(),
+        'sales_by_category': sample_data.categories(),
+        'top_products': sample_data.top_products(),
+        'recent_activities': [],
+        'notifications': [],
+        'user_roles': ['Customer', 'Admin', 'Vendor', 'Support'],
+        'user_stats': {'active': 35, 'inactive': 10, 'suspended': 5, 'by_role': {'customer': 40}},
+    },
+}
+
+
+def time_per_call(func, iterations):
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main(iterations=200):
+    app = index.app
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    print(f"{'template':<24}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    with app.test_request_context('/'):
+        for name, context in SAMPLE_CONTEXTS.items():
+            with open(os.path.join(template_dir, name)) as f:
+                source = f.read()
+            before = time_per_call(lambda: render_template_string(source, **context), iterations)
+            after = time_per_call(lambda: render_template(name, **context), iterations)
+            print(f"{name:<24}{before * 1000:>14.3f}{after * 1000:>14.3f}{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
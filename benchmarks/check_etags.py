@@ -0,0 +1,92 @@
+"""Fail if a page answers 304 Not Modified after the data behind it changed.
+
+Registers a user and adds a product between two requests for /admin and
+/marketplace, the second sent with If-None-Match set to the first ETag,
+and exits non-zero unless it is a 200 with a different ETag (or none).
+Runs against a copy of marketplace.db as checked in, which predates
+migrations, and against a migrated copy of it.
+
+    python benchmarks/check_etags.py
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import catalog
+import index
+import migrations
+from db_pool import ConnectionPool
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'marketplace.db')
+ADMIN = {'username': 'administrator', 'password': 'c4ptain5ecur3'}
+
+
+def add_product(path, name):
+    with sqlite3.connect(path) as db:
+        db.execute("INSERT INTO products (name, description, price, category) VALUES (?, '', 1.0, 'Books')", (name,))
+    db.close()
+
+
+def revalidate(client, page, change, expected):
+    """Problems found requesting `page` again after `change()`"""
+    first = client.get(page)
+    if first.status_code != 200:
+        return [f"{page} returned {first.status_code}"]
+    etag = first.headers.get('ETag')
+    change()
+    # With no ETag to send, * still asks for a 304 if the server has one
+    second = client.get(page, headers={'If-None-Match': etag or '*'})
+    problems = []
+    if second.status_code != 200:
+        problems.append(f"{page} returned {second.status_code} after a write")
+    elif etag is not None and second.headers.get('ETag') == etag:
+        problems.append(f"{page} kept ETag {etag} after a write")
+    elif expected not in second.get_data(as_text=True):
+        problems.append(f"{page} does not show {expected!r} after a write")
+    return problems
+
+
+def check(path):
+    index.db_pool = ConnectionPool(path)
+    index.schema.clear()
+    catalog.invalidate()
+
+    admin = index.app.test_client()
+    admin.post('/process_login', data=ADMIN)
+
+    def register():
+        index.app.test_client().post('/process_register', data={
+            'username': 'etag_check', 'password': 'x', 'confirm_password': 'x'})
+
+    problems = revalidate(admin, '/admin', register, 'etag_check')
+    problems += revalidate(admin, '/marketplace', lambda: add_product(path, 'ETag Check Book'), 'ETag Check Book')
+    index.db_pool.close_all()
+    return problems
+
+
+def main():
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        unmigrated = os.path.join(tmp, 'unmigrated.db')
+        migrated = os.path.join(tmp, 'migrated.db')
+        shutil.copy(SOURCE, unmigrated)
+        shutil.copy(SOURCE, migrated)
+        with sqlite3.connect(migrated) as db:
+            migrations.migrate(db)
+        db.close()
+
+        for name, path in [('unmigrated', unmigrated), ('migrated', migrated)]:
+            problems = check(path)
+            failed += bool(problems)
+            print(f"{'FAIL' if problems else 'ok':<6}{name} marketplace.db")
+            for problem in problems:
+                print(f"        {problem}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Fail if a page needs the network to load its scripts, styles or fonts.
+
+Renders / and /admin through the test client with outgoing connections
+refused, and exits non-zero if a script or stylesheet points at another
+host, or if any script, stylesheet, preload, fingerprinted asset or
+url(...) in a served stylesheet does not load with a 200. Images that
+stylesheets load from other hosts are listed but do not fail the check;
+the page works without them.
+
+If node is installed, the scripts /admin loads are also run, in order,
+against a stub DOM, and the check fails unless each <canvas> on the page
+ends up with a Chart.js chart, so a Chart.js upgrade that no longer
+accepts the dashboard's chart options is caught.
+
+    python benchmarks/check_offline_assets.py
+"""
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import urllib.parse
+from html.parser import HTMLParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import assets
+import index
+
+ADMIN = {'username': 'administrator', 'password': 'c4ptain5ecur3'}
+
+# page, log in as
+PAGES = [('/', None), ('/admin', ADMIN)]
+
+# Runs the page's scripts with Chart.js loaded in a context of its own that
+# has no window or document, so it picks its BasicPlatform (no DOM needed)
+# and draws into a no-op 2d context. Prints the number of working charts;
+# exits non-zero if a script throws or Chart.js logs an error.
+CHART_HARNESS = r"""
+const vm = require('vm');
+const page = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+
+// Any property of a stub is another stub, and so is any call's result
+function stub() {
+    return new Proxy(function () {}, {
+        get: (target, key) => key === Symbol.toPrimitive ? () => '' : key === 'then' ? undefined : stub(),
+        set: () => true,
+        apply: () => stub(),
+    });
+}
+
+function canvas(id) {
+    const element = {id, width: 400, height: 300, replaceWith: () => {}};
+    const context = new Proxy({canvas: element}, {
+        get: (target, key) => key in target ? target[key]
+            : typeof key !== 'string' || key === 'length' ? undefined
+            : key === 'measureText' ? text => ({width: String(text).length * 6})
+            : key === 'getLineDash' ? () => []
+            : () => stub(),
+        set: (target, key, value) => { target[key] = value; return true; },
+    });
+    element.getContext = () => context;
+    return element;
+}
+
+const elements = {};
+for (const id of page.canvases) elements[id] = canvas(id);
+for (const [id, text] of Object.entries(page.text)) elements[id] = {id, textContent: text};
+
+function fail(message) {
+    console.error(String(message));
+    process.exit(1);
+}
+
+const chartRealm = vm.createContext({console: {log: console.log, warn: fail, error: fail}});
+const pageRealm = vm.createContext({
+    console, setTimeout, clearTimeout, URLSearchParams,
+    window: stub(), location: stub(), fetch: () => new Promise(() => {}),
+    document: new Proxy({}, {
+        get: (target, key) => key === 'getElementById' ? id => elements[id] || stub() : stub(),
+    }),
+});
+for (const [url, source] of page.scripts) {
+    try {
+        if (url.includes('/vendor/chartjs/')) {
+            vm.runInContext(source, chartRealm, {filename: url});
+            pageRealm.Chart = chartRealm.Chart;
+        } else {
+            vm.runInContext(source, pageRealm, {filename: url});
+        }
+    } catch (e) {
+        fail(`${url}: ${e.message}`);
+    }
+}
+// A chart whose context could not be acquired exists but never draws
+const charts = chartRealm.Chart ? Object.values(chartRealm.Chart.instances) : [];
+console.log(charts.filter(chart => chart.ctx).length);
+"""
+
+
+class AssetLinks(HTMLParser):
+    """src of <script> and href of <link> tags, in page order, plus what
+    running the page's scripts needs: script URLs, <canvas> ids and the
+    text of inline <script> tags with an id"""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+        self.scripts = []
+        self.canvases = []
+        self.text = {}
+        self._inline = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script' and attrs.get('src'):
+            self.urls.append(attrs['src'])
+            self.scripts.append(attrs['src'])
+        elif tag == 'script' and attrs.get('id'):
+            self._inline = attrs['id']
+            self.text[self._inline] = ''
+        elif tag == 'link' and attrs.get('href'):
+            self.urls.append(attrs['href'])
+        elif tag == 'canvas' and attrs.get('id'):
+            self.canvases.append(attrs['id'])
+
+    def handle_data(self, data):
+        if self._inline:
+            self.text[self._inline] += data
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self._inline = None
+
+
+def refuse_connections(*args, **kwargs):
+    raise OSError("network access during the offline asset check")
+
+
+def is_external(url):
+    return url.startswith(('http:', 'https:', '//'))
+
+
+def css_urls(css_url, css):
+    """Absolute paths of the url(...) references in a stylesheet"""
+    for match in assets.CSS_URL_RE.finditer(css):
+        url = match.group(2).strip()
+        if url.startswith(('data:', '#')):
+            continue
+        yield url if is_external(url) else urllib.parse.urljoin(css_url, url)
+
+
+def check(client, page):
+    """Problems and warnings found loading `page` and everything it
+    references, and the number of URLs checked"""
+    response = client.get(page)
+    if response.status_code != 200:
+        return [f"{page} returned {response.status_code}"], [], 0
+    parser = AssetLinks()
+    parser.feed(response.get_data(as_text=True))
+    # (url, stylesheet it came from)
+    pending = [(url, None) for url in parser.urls]
+    checked = set()
+    problems = []
+    warnings = []
+    while pending:
+        url, stylesheet = pending.pop(0)
+        if url in checked:
+            continue
+        checked.add(url)
+        if is_external(url):
+            if stylesheet and not url.split('?')[0].endswith('.css'):
+                warnings.append(f"{stylesheet} loads an image from another host: {url}")
+            else:
+                problems.append(f"{page} loads {url} from another host")
+            continue
+        asset = client.get(urllib.parse.urlsplit(url).path)
+        if asset.status_code != 200:
+            problems.append(f"{page}: {url} returned {asset.status_code}")
+        elif url.split('?')[0].endswith('.css'):
+            pending.extend((ref, url) for ref in css_urls(url, asset.get_data(as_text=True)))
+        asset.close()
+    return problems, warnings, len(checked)
+
+
+def check_charts(client, page):
+    """Problems found running the scripts of `page`: one unless every
+    <canvas> gets a chart"""
+    parser = AssetLinks()
+    parser.feed(client.get(page).get_data(as_text=True))
+    scripts = []
+    for url in parser.scripts:
+        response = client.get(urllib.parse.urlsplit(url).path)
+        scripts.append((url, response.get_data(as_text=True)))
+        response.close()
+    payload = json.dumps({'scripts': scripts, 'canvases': parser.canvases, 'text': parser.text})
+    result = subprocess.run(['node', '-e', CHART_HARNESS], input=payload, capture_output=True, text=True)
+    if result.returncode != 0:
+        return [f"{page} scripts failed: {result.stderr.strip() or result.returncode}"]
+    created = int(result.stdout.strip().splitlines()[-1])
+    if created != len(parser.canvases):
+        return [f"{page} created {created} of {len(parser.canvases)} charts"]
+    return []
+
+
+def main():
+    socket.socket.connect = refuse_connections
+    socket.create_connection = refuse_connections
+
+    failed = 0
+    for page, login in PAGES:
+        client = index.app.test_client()
+        if login:
+            client.post('/process_login', data=login)
+        found, warnings, checked = check(client, page)
+        failed += bool(found)
+        print(f"{'FAIL' if found else 'ok':<6}{page} ({checked} assets)")
+        for problem in found:
+            print(f"        {problem}")
+        for warning in warnings:
+            print(f"        warning: {warning}")
+
+    if shutil.which('node'):
+        client = index.app.test_client()
+        client.post('/process_login', data=ADMIN)
+        found = check_charts(client, '/admin')
+        failed += bool(found)
+        print(f"{'FAIL' if found else 'ok':<6}/admin charts")
+        for problem in found:
+            print(f"        {problem}")
+    else:
+        print(f"{'skip':<6}/admin charts (node is not installed)")
+
+    # Every fingerprinted copy asset_url can hand out must be served
+    client = index.app.test_client()
+    with index.app.test_request_context():
+        missing = []
+        for name in sorted(assets.manifest):
+            response = client.get(assets.asset_url(name))
+            if response.status_code != 200:
+                missing.append(f"{name} returned {response.status_code}")
+            response.close()
+    failed += bool(missing)
+    print(f"{'FAIL' if missing else 'ok':<6}{len(assets.manifest)} fingerprinted assets")
+    for problem in missing:
+        print(f"        {problem}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
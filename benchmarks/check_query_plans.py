@@ -0,0 +1,75 @@
+"""Fail if a hot-path query would read a whole table.
+
+Runs EXPLAIN QUERY PLAN for the queries behind /admin and /marketplace and
+exits non-zero if any of them scans a table without an index or sorts
+through a temporary b-tree. Checks a freshly migrated in-memory database
+unless a database file is given.
+
+    python benchmarks/check_query_plans.py [database]
+"""
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import catalog
+import dashboard
+import migrations
+
+USER_COLUMNS = ['id', 'username', 'email', 'status', 'role']
+
+QUERIES = {
+    'dashboard stats': (dashboard.STATS_QUERY, ()),
+    'top products': (dashboard.TOP_PRODUCTS_QUERY, (5,)),
+    'recent sales': (dashboard.RECENT_SALES_QUERY, (5,)),
+    'users': dashboard.users_query(USER_COLUMNS),
+    'users after': dashboard.users_query(USER_COLUMNS, after=[1000]),
+    'users by status': dashboard.users_query(USER_COLUMNS, status='active', after=[1000]),
+    'users by role': dashboard.users_query(USER_COLUMNS, role='vendor', after=[1000]),
+    'users by status and role': dashboard.users_query(USER_COLUMNS, status='active', role='vendor', after=[1000]),
+    'users by username prefix': dashboard.users_query(USER_COLUMNS, status='active', search='adm', after=['admin', 1]),
+    'users by email prefix': dashboard.users_query(USER_COLUMNS, search='admin@', after=['admin@example.com', 1]),
+    'monthly sales': (
+        "SELECT strftime('%Y-%m', sale_date) AS month, SUM(total_price) FROM sales "
+        "GROUP BY strftime('%Y-%m', sale_date) ORDER BY month", ()),
+    'table versions': ("SELECT name, version FROM table_versions", ()),
+    'products': (catalog.PRODUCTS_QUERY, (0, 25)),
+    'products before': (catalog.PRODUCTS_BEFORE_QUERY, (100, 25)),
+    'products by category': (catalog.PRODUCTS_BY_CATEGORY_QUERY, ('Electronics', 0, 25)),
+    'products by category before': (catalog.PRODUCTS_BY_CATEGORY_BEFORE_QUERY, ('Electronics', 100, 25)),
+}
+
+# Tables small enough that reading all of them is the plan we want
+SMALL_TABLES = ('table_versions',)
+
+
+def problems(query, plan):
+    # An unfiltered ORDER BY ... LIMIT with no sort step reads the table in
+    # key order and stops after LIMIT rows, which is fine
+    top_n = ' WHERE ' not in query.upper() and ' LIMIT ' in query.upper()
+    for detail in plan:
+        if detail.startswith('USE TEMP B-TREE'):
+            yield detail
+        elif detail.startswith('SCAN ') and 'INDEX' not in detail:
+            if detail.split()[1] not in SMALL_TABLES and not top_n:
+                yield detail
+
+
+def main(database=':memory:'):
+    conn = sqlite3.connect(database)
+    migrations.migrate(conn)
+    failed = 0
+    for name, (query, params) in QUERIES.items():
+        plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + query, params)]
+        bad = list(problems(query, plan))
+        failed += bool(bad)
+        print(f"{'FAIL' if bad else 'ok':<6}{name}")
+        for detail in plan:
+            print(f"        {detail}")
+    conn.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
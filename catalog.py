@@ -0,0 +1,152 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# Keyset pagination on (category, id): a page starts right after (or ends
+# right before) a known product id, so each query reads at most
+# page_size + 1 rows from idx_products_category or the primary key
+# regardless of how deep into the catalog the page is.
+PRODUCT_COLUMNS = "SELECT name, description, price, category, id FROM products"
+PRODUCTS_QUERY = PRODUCT_COLUMNS + " WHERE id > ? ORDER BY id LIMIT ?"
+PRODUCTS_BEFORE_QUERY = PRODUCT_COLUMNS + " WHERE id < ? ORDER BY id DESC LIMIT ?"
+PRODUCTS_BY_CATEGORY_QUERY = PRODUCT_COLUMNS + " WHERE category = ? AND id > ? ORDER BY id LIMIT ?"
+PRODUCTS_BY_CATEGORY_BEFORE_QUERY = PRODUCT_COLUMNS + " WHERE category = ? AND id < ? ORDER BY id DESC LIMIT ?"
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, max_entries=256, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+product_cache = ResultCache()
+
+# Callbacks run by invalidate(), for caches built on top of catalog data
+_invalidation_listeners = []
+
+
+def table_version(db, table):
+    """Write counter of a table, maintained by triggers (see migration 3).
+
+    Returns None if the database predates the table_versions table or the
+    table is not tracked; writes then leave no trace, so nothing derived
+    from the table may be cached.
+    """
+    try:
+        row = db.execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def table_versions(db):
+    """Write counters of all tracked tables as a dict, in one query"""
+    try:
+        return dict(db.execute("SELECT name, version FROM table_versions").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+def clamp_page_size(page_size):
+    """`page_size` limited to 1..MAX_PAGE_SIZE"""
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def list_products(db, category=None, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, version=None):
+    """One page of products in a category (or all of them).
+
+    Pass the id of the last product on the current page as `after` to get
+    the next page, or the id of the first one as `before` to get the
+    previous page. Returns (products, next_after, prev_before); the cursors
+    are None when there is no page in that direction.
+
+    The SQL text is constant and the filter is bound as parameters, so
+    sqlite3's per-connection statement cache reuses the compiled statement.
+    Pages are served from the result cache when possible; the cache is
+    keyed on the products table version, so writes from any process make
+    older entries unreachable. Pass `version` if the caller already has it.
+    Without a version (an unmigrated database) pages are never cached.
+    """
+    page_size = clamp_page_size(page_size)
+    if version is None:
+        version = table_version(db, 'products')
+    key = ('products', version, category or '', after, before, page_size)
+    if version is not None:
+        page = product_cache.get(key)
+        if page is not None:
+            return page
+
+    if before is not None:
+        if category:
+            rows = db.execute(PRODUCTS_BY_CATEGORY_BEFORE_QUERY, (category, before, page_size + 1)).fetchall()
+        else:
+            rows = db.execute(PRODUCTS_BEFORE_QUERY, (before, page_size + 1)).fetchall()
+        has_prev = len(rows) > page_size
+        products = rows[:page_size]
+        products.reverse()
+        has_next = True
+    else:
+        if category:
+            rows = db.execute(PRODUCTS_BY_CATEGORY_QUERY, (category, after or 0, page_size + 1)).fetchall()
+        else:
+            rows = db.execute(PRODUCTS_QUERY, (after or 0, page_size + 1)).fetchall()
+        has_next = len(rows) > page_size
+        products = rows[:page_size]
+        has_prev = after is not None
+
+    next_after = products[-1][4] if products and has_next else None
+    prev_before = products[0][4] if products and has_prev else None
+    page = (products, next_after, prev_before)
+    if version is not None:
+        product_cache.set(key, page)
+    return page
+
+
+def on_invalidate(callback):
+    """Register a callback to run whenever cached listings are dropped"""
+    _invalidation_listeners.append(callback)
+    return callback
+
+
+def invalidate():
+    """Drop cached listings; call after any product insert, update or delete"""
+    product_cache.clear()
+    for callback in _invalidation_listeners:
+        callback()
@@ -0,0 +1,126 @@
+import gzip
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+}
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.html', '.txt', '.json', '.svg')
+
+# Suffix of the precompressed copy of a static file for each encoding
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class Compressor:
+    """Compresses responses according to the client's Accept-Encoding.
+
+    Dynamic responses over COMPRESS_MIN_SIZE bytes are compressed in an
+    after_request hook at COMPRESS_LEVEL (gzip) / COMPRESS_BR_LEVEL
+    (brotli). Static files are compressed once at startup at maximum level
+    and the precompressed copies are served directly.
+    """
+
+    def __init__(self, app=None):
+        self.app = app
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.level = app.config.get('COMPRESS_LEVEL', 6)
+        self.br_level = app.config.get('COMPRESS_BR_LEVEL', 5)
+        self.encodings = ['br', 'gzip'] if brotli else ['gzip']
+
+        app.after_request(self.after_request)
+        if app.static_folder and os.path.isdir(app.static_folder):
+            self.precompress_static(app.static_folder)
+            app.view_functions['static'] = self.send_static
+
+    def negotiate(self):
+        return request.accept_encodings.best_match(self.encodings)
+
+    def compress(self, data, encoding, level=None):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.br_level if level is None else level)
+        return gzip.compress(data, compresslevel=self.level if level is None else level, mtime=0)
+
+    def after_request(self, response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        encoding = self.negotiate()
+        if not encoding:
+            return response
+
+        response.set_data(self.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        if response.headers.get('ETag') and not response.headers['ETag'].startswith('W/'):
+            # A strong ETag identifies the exact bytes, which just changed
+            etag, _ = response.get_etag()
+            response.set_etag(f"{etag}-{encoding}")
+        return response
+
+    def precompress_static(self, static_folder):
+        """Write .gz (and .br) copies of compressible static files that are
+        missing or older than their source"""
+        for root, _, files in os.walk(static_folder):
+            for name in files:
+                if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if len(data) < self.min_size:
+                    continue
+                for encoding in self.encodings:
+                    target = path + ENCODING_SUFFIXES[encoding]
+                    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                        continue
+                    level = 11 if encoding == 'br' else 9
+                    # Workers starting together all do this; a temp name of
+                    # their own keeps one from moving another's half-written
+                    # file. The last rename wins with identical content.
+                    tmp = f"{target}.{os.getpid()}.tmp"
+                    with open(tmp, 'wb') as f:
+                        f.write(self.compress(data, encoding, level))
+                    os.replace(tmp, target)
+
+    def send_static(self, filename):
+        """Static file view that prefers a precompressed copy"""
+        static_folder = self.app.static_folder
+        encoding = self.negotiate()
+        if encoding:
+            compressed = filename + ENCODING_SUFFIXES[encoding]
+            if os.path.isfile(os.path.join(static_folder, compressed)):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(static_folder, compressed, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                response.vary.add('Accept-Encoding')
+                return response
+        response = send_from_directory(static_folder, filename)
+        response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,205 @@
+import json
+import sqlite3
+import string
+import sys
+
+import migrations
+
+# Statuses with their own card on the dashboard and in the listing's
+# filter. Users with any other status only count towards the total, so
+# each card matches what its filter lists.
+USER_STATUSES = ('active', 'inactive', 'suspended')
+
+# Case folding done by SQLite's NOCASE collation
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+DEFAULT_USERS_PAGE_SIZE = 50
+MAX_USERS_PAGE_SIZE = 200
+
+# Everything except the per-product rows, which can number in the millions
+# and are only ever read through TOP_PRODUCTS_QUERY. Each metric in the IN
+# list is an index seek, not a scan.
+STATS_QUERY = """
+    SELECT metric, key, count, total FROM dashboard_stats
+    WHERE metric IN ('users', 'products', 'sales', 'status', 'role', 'month', 'category')
+"""
+TOP_PRODUCTS_QUERY = """
+    SELECT p.name, s.count FROM dashboard_stats s JOIN products p ON p.id = s.key
+    WHERE s.metric = 'product' AND s.count > 0
+    ORDER BY s.count DESC LIMIT ?
+"""
+RECENT_SALES_QUERY = """
+    SELECT u.username, s.total_price, s.sale_date
+    FROM sales s JOIN users u ON s.user_id = u.id
+    ORDER BY s.sale_date DESC LIMIT ?
+"""
+
+
+def load(db, top=5):
+    """Dashboard statistics from the dashboard_stats summary table.
+
+    The table is kept current by triggers on users, products and sales
+    (see migration 5), so this is two indexed reads however large those
+    tables grow. Returns None if the database predates the summary table.
+    """
+    try:
+        rows = db.execute(STATS_QUERY).fetchall()
+        top_products = [tuple(row) for row in db.execute(TOP_PRODUCTS_QUERY, (top,))]
+    except sqlite3.OperationalError:
+        return None
+
+    stats = {
+        'total_users': 0,
+        'total_products': 0,
+        'total_sales_count': 0,
+        'total_sales_amount': 0,
+        'user_stats': {'active': 0, 'inactive': 0, 'suspended': 0, 'by_role': {}},
+        'monthly_sales': [],
+        'sales_by_category': [],
+        'top_products': top_products,
+    }
+    user_stats = stats['user_stats']
+    for metric, key, count, total in rows:
+        if metric == 'users':
+            stats['total_users'] = count
+        elif metric == 'products':
+            stats['total_products'] = count
+        elif metric == 'sales':
+            stats['total_sales_count'] = count
+            stats['total_sales_amount'] = round(total, 2)
+        elif count <= 0:
+            # Rows whose users or sales have all been deleted
+            continue
+        elif metric == 'status':
+            if key in USER_STATUSES:
+                user_stats[key] = count
+        elif metric == 'role':
+            user_stats['by_role'][key] = count
+        elif metric == 'month':
+            stats['monthly_sales'].append((key, round(total, 2)))
+        elif metric == 'category':
+            stats['sales_by_category'].append((key, round(total, 2)))
+
+    stats['monthly_sales'].sort()
+    stats['sales_by_category'].sort(key=lambda row: row[1], reverse=True)
+    return stats
+
+
+def recent_sales(db, limit=5):
+    """(username, total_price, sale_date) of the newest sales"""
+    return db.execute(RECENT_SALES_QUERY, (limit,)).fetchall()
+
+
+def users_query(columns, status=None, role=None, search=None, after=None, page_size=DEFAULT_USERS_PAGE_SIZE):
+    """SQL and parameters for one page of the user listing.
+
+    Without a search the listing is newest first by id; status and role
+    are equality filters served by idx_users_status, idx_users_role and
+    idx_users_status_role (see migration 7). A search is a case-insensitive
+    prefix match on username, or on email if it contains '@', written as a
+    NOCASE range so it reads idx_users_username_nocase or
+    idx_users_email_nocase (see migration 10) in order. `after` is the
+    cursor returned with the previous page.
+    """
+    where = []
+    params = []
+    # With a search the prefix index must drive the query so rows come out
+    # in cursor order; the unary + keeps SQLite from picking the status or
+    # role index instead and sorting every match
+    hint = '+' if search else ''
+    if status:
+        where.append(f'{hint}status = ?')
+        params.append(status)
+    if role:
+        where.append(f'{hint}role = ?')
+        params.append(role)
+    if search:
+        field = 'email' if '@' in search else 'username'
+        key = f'{field} COLLATE NOCASE'
+        where.append(f'{key} >= ?')
+        params.append(search)
+        upper = prefix_upper_bound(search)
+        if upper is not None:
+            where.append(f'{key} < ?')
+            params.append(upper)
+        if after:
+            if len(after) != 2:
+                raise ValueError("Cursor does not belong to a search")
+            where.append(f'({key}, id) > (?, ?)')
+            params += after
+        order = f'{key}, id'
+    else:
+        if after:
+            where.append('id < ?')
+            params.append(after[-1])
+        order = 'id DESC'
+        field = None
+
+    # The sort key goes last so the cursor can be read off the final row
+    select = list(columns) + ([field] if field else []) + ['id']
+    query = f"SELECT {', '.join(select)} FROM users"
+    if where:
+        query += ' WHERE ' + ' AND '.join(where)
+    query += f' ORDER BY {order} LIMIT ?'
+    params.append(page_size + 1)
+    return query, params
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string above every string starting with `prefix` under
+    NOCASE, or None if there is none.
+
+    NOCASE compares ASCII letters as lower case, so the prefix is folded
+    the same way before its last character is incremented, and the
+    increment skips 'A'-'Z' and the surrogates, which cannot be stored.
+    """
+    prefix = prefix.translate(ASCII_LOWER).rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    last = ord(prefix[-1]) + 1
+    if ord('A') <= last <= ord('Z'):
+        last = ord('Z') + 1
+    elif 0xD800 <= last <= 0xDFFF:
+        last = 0xE000
+    return prefix[:-1] + chr(last)
+
+
+def list_users(db, columns, status=None, role=None, search=None, after=None, page_size=DEFAULT_USERS_PAGE_SIZE):
+    """One page of users as (rows, next_cursor).
+
+    Rows hold the requested `columns` in order. next_cursor is an opaque
+    string to pass back as `after` for the following page, or None on the
+    last page. Each page is an index range read of page_size + 1 rows,
+    however many users match.
+    """
+    page_size = max(1, min(page_size, MAX_USERS_PAGE_SIZE))
+    if isinstance(after, str):
+        after = decode_cursor(after)
+    query, params = users_query(columns, status, role, search, after, page_size)
+    rows = db.execute(query, params).fetchall()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        key = tuple(rows[-1])[len(columns):]
+        next_cursor = json.dumps(list(key))
+    return [tuple(row)[:len(columns)] for row in rows], next_cursor
+
+
+def decode_cursor(cursor):
+    """Cursor string from list_users as a list, ValueError if malformed"""
+    key = json.loads(cursor)
+    if not isinstance(key, list) or not 1 <= len(key) <= 2 or not isinstance(key[-1], int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key
+
+
+def rebuild(db):
+    """Recompute dashboard_stats from the base tables.
+
+    The triggers keep it current row by row; this is for repairing drift
+    or after loading data with the triggers dropped.
+    """
+    with db:
+        db.execute('DELETE FROM dashboard_stats')
+        for statement in migrations.DASHBOARD_BACKFILL:
+            db.execute(statement)
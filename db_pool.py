@@ -0,0 +1,98 @@
+import os
+import queue
+import sqlite3
+import threading
+
+# Applied once when a connection is opened, not on every request
+DEFAULT_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('cache_size', -16000),  # negative means KiB, so ~16MB of page cache
+    ('temp_store', 'MEMORY'),
+)
+
+
+class ConnectionPool:
+    """Pool of warm SQLite connections shared by request threads.
+
+    Connections are handed to one thread at a time and returned at request
+    teardown, so the connection setup, schema parse and page cache are paid
+    once per connection instead of once per request.
+    """
+
+    def __init__(self, database, max_idle=16, pragmas=DEFAULT_PRAGMAS, row_factory=sqlite3.Row, cached_statements=256):
+        self.database = database
+        self.max_idle = max_idle
+        self.cached_statements = cached_statements
+        self.pragmas = pragmas
+        self.row_factory = row_factory
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.in_use = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, check_same_thread=False, cached_statements=self.cached_statements)
+        conn.row_factory = self.row_factory
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: connections opened by the parent must not be reused
+                self._reset()
+            self.in_use += 1
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            with self._lock:
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        return conn
+
+    def release(self, conn, discard=False):
+        with self._lock:
+            self.in_use -= 1
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+        if discard or self._idle.qsize() >= self.max_idle:
+            conn.close()
+            with self._lock:
+                self.discarded += 1
+            return
+        self._idle.put(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def stats(self):
+        with self._lock:
+            return {
+                'database': self.database,
+                'created': self.created,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'in_use': self.in_use,
+                'idle': self._idle.qsize(),
+            }
@@ -0,0 +1,180 @@
+import re
+import sqlite3
+
+from markupsafe import Markup, escape
+
+import catalog
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+SNIPPET_WORDS = 16
+
+# Ranking is bounded: bm25() scores only the CANDIDATE_LIMIT newest
+# matches (FTS5 reads rowids in descending order without sorting), and the
+# best `limit` of those are joined to products. Results are therefore the
+# best among recent matches, not among all of them, once a query matches
+# more rows than that. Matches in the name or username are ranked in a
+# first pass of their own, so a name hit is never crowded out of the
+# candidates by newer description hits.
+#
+# bm25() still makes one pass over each term's posting list to count the
+# rows containing it, in each of the two passes, so on a million products
+# a query costs under a millisecond for a rare word but 10-45ms for words
+# in a sixth of the catalog. highlight() and snippet() are not used
+# because SQLite would evaluate them for every candidate; the handful of
+# rows returned are highlighted in Python instead.
+CANDIDATE_LIMIT = 2000
+
+PRODUCTS_QUERY = """
+    SELECT p.id, p.name, p.description, p.price, p.category
+    FROM (
+        SELECT rowid, score FROM (
+            SELECT rowid, bm25(products_fts, 10.0, 1.0, 2.0) AS score FROM products_fts
+            WHERE products_fts MATCH ? ORDER BY rowid DESC LIMIT ?
+        ) ORDER BY score LIMIT ?
+    ) AS hits JOIN products p ON p.id = hits.rowid
+    ORDER BY hits.score
+"""
+USERS_QUERY = """
+    SELECT u.id, u.username, u.email
+    FROM (
+        SELECT rowid, score FROM (
+            SELECT rowid, bm25(users_fts, 5.0, 1.0) AS score FROM users_fts
+            WHERE users_fts MATCH ? ORDER BY rowid DESC LIMIT ?
+        ) ORDER BY score LIMIT ?
+    ) AS hits JOIN users u ON u.id = hits.rowid
+    ORDER BY hits.score
+"""
+# Column searched in the first pass
+NAME_COLUMNS = {'products': 'name', 'users': 'username'}
+
+# Keyed on the table version like the product listings, so any write to
+# products or users makes older results unreachable
+search_cache = catalog.ResultCache(max_entries=1024, ttl=60.0)
+catalog.on_invalidate(search_cache.clear)
+
+TOKEN_RE = re.compile(r'\w+')
+WORD_RE = re.compile(r'\S+')
+
+
+def tokens(text):
+    return TOKEN_RE.findall(text or '')
+
+
+def fts_query(words):
+    """FTS5 MATCH expression for words typed by a user.
+
+    Each word becomes a quoted term, so FTS5 operators and punctuation in
+    the input are matched literally instead of raising a syntax error, and
+    the last word is a prefix so results appear while typing. A single
+    character is not: as a prefix it matches a large part of the index.
+    """
+    terms = [f'"{word}"' for word in words]
+    if len(words[-1]) > 1:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def match_pattern(words):
+    """Regex finding the words of a query in result text, the last as a
+    prefix as in fts_query"""
+    alternatives = [re.escape(word) + r'\b' for word in words]
+    if len(words[-1]) > 1:
+        alternatives[-1] = re.escape(words[-1]) + r'\w*'
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + ')', re.IGNORECASE)
+
+
+def marked(text, pattern):
+    """Escaped HTML of `text` with the matches of `pattern` in <mark> tags"""
+    text = text or ''
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        parts.append(Markup('<mark>%s</mark>') % match.group())
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return Markup('').join(parts)
+
+
+def snippet(text, pattern, words=SNIPPET_WORDS):
+    """About `words` words of `text` around its first match, marked up"""
+    text = text or ''
+    spans = [match.span() for match in WORD_RE.finditer(text)]
+    if len(spans) <= words:
+        return marked(text, pattern)
+    match = pattern.search(text)
+    first = 0
+    if match:
+        first = next(i for i, (start, end) in enumerate(spans) if end > match.start())
+    start = max(0, min(first - words // 4, len(spans) - words))
+    end = start + words
+    html = marked(text[spans[start][0]:spans[end - 1][1]], pattern)
+    return Markup('{}{}{}').format('…' if start else '', html, '…' if end < len(spans) else '')
+
+
+def search_products(db, text, limit=DEFAULT_LIMIT):
+    """Products matching `text`, best first.
+
+    Each result is a dict with id, name, price and category plus
+    name_html and snippet_html, escaped HTML with the matched words in
+    <mark> tags. When more than CANDIDATE_LIMIT products match, they are
+    the best of the newest matches (see PRODUCTS_QUERY).
+    """
+    return _search(db, 'products', text, limit)
+
+
+def search_users(db, text, limit=DEFAULT_LIMIT):
+    """Users whose username or email match `text`, best first"""
+    return _search(db, 'users', text, limit)
+
+
+def _search(db, table, text, limit):
+    words = tokens(text)
+    if not words:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    query = fts_query(words)
+    version = catalog.table_version(db, table)
+    key = (table, version, query, limit)
+    if version is not None:
+        results = search_cache.get(key)
+        if results is not None:
+            return results
+
+    pattern = match_pattern(words)
+    try:
+        rows = ranked_rows(db, table, query, limit)
+        if table == 'products':
+            results = [
+                {'id': row[0], 'name': row[1], 'price': row[3], 'category': row[4],
+                 'name_html': marked(row[1], pattern), 'snippet_html': snippet(row[2], pattern)}
+                for row in rows
+            ]
+        else:
+            results = [
+                {'id': row[0], 'username': row[1], 'email': row[2],
+                 'username_html': marked(row[1], pattern), 'email_html': marked(row[2], pattern)}
+                for row in rows
+            ]
+    except sqlite3.OperationalError:
+        # Database predates the search index (migration 8)
+        return []
+    if version is not None:
+        search_cache.set(key, results)
+    return results
+
+
+def ranked_rows(db, table, query, limit):
+    """Best `limit` rows of `table` matching `query`: name matches first,
+    then matches in any column, each ranked among their newest
+    CANDIDATE_LIMIT"""
+    sql = PRODUCTS_QUERY if table == 'products' else USERS_QUERY
+    name_query = f'{{{NAME_COLUMNS[table]}}} : ({query})'
+    rows = db.execute(sql, (name_query, CANDIDATE_LIMIT, limit)).fetchall()
+    if len(rows) < limit:
+        seen = {row[0] for row in rows}
+        more = db.execute(sql, (query, CANDIDATE_LIMIT, limit)).fetchall()
+        rows += [row for row in more if row[0] not in seen][:limit - len(rows)]
+    return rows
@@ -0,0 +1,252 @@
+"""Build a marketplace database with production-sized synthetic data.
+
+    python loadgen.py --users 1000000 --products 100000 --sales 10000000 [--seed 42] [--output marketplace.db]
+
+The database is built in a scratch file next to the output and moved into
+place when complete, so a failed run never leaves a half-loaded database
+behind; stop the app before replacing the database it has open. The same
+seed and sizes always produce the same rows.
+
+Loading is fast because nothing derived is maintained row by row: the
+triggers and secondary indexes of the loaded tables are dropped first,
+rows go in with executemany in one transaction per table, and afterwards
+the indexes are rebuilt in bulk, the dashboard summary and search indexes
+are recomputed once and the triggers are put back.
+"""
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import dashboard
+import migrations
+
+BATCH_SIZE = 50000
+
+TABLES = ('users', 'products', 'sales')
+
+# Bulk-load settings for the scratch database; nothing else has it open
+# and a crash just means running the generator again
+LOAD_PRAGMAS = (
+    ('journal_mode', 'OFF'),
+    ('synchronous', 'OFF'),
+    ('locking_mode', 'EXCLUSIVE'),
+    ('cache_size', -256000),
+    ('temp_store', 'MEMORY'),
+)
+
+STATUSES = (('active', 80), ('inactive', 15), ('suspended', 5))
+ROLES = (('customer', 90), ('vendor', 7), ('support', 2), ('admin', 1))
+COUNTRIES = ('US', 'UK', 'CA', 'AU', 'DE', 'FR', 'JP', 'IN', 'BR', 'NL')
+CATEGORIES = (('Electronics', 30), ('Clothing', 25), ('Appliances', 15), ('Home & Kitchen', 15), ('Books', 10), ('Toys', 5))
+ADJECTIVES = ('Smart', 'Pro', 'Ultra', 'Classic', 'Compact', 'Wireless', 'Premium', 'Eco', 'Portable', 'Deluxe')
+NOUNS = ('Phone', 'Laptop', 'Watch', 'Blender', 'Toaster', 'Jeans', 'Shoes', 'Speaker', 'Camera', 'Lamp', 'Kettle', 'Jacket')
+FEATURES = ('fast', 'durable', 'lightweight', 'quiet', 'stylish', 'waterproof', 'energy efficient', 'easy to clean')
+QUANTITIES = ((1, 70), (2, 20), (3, 6), (4, 3), (5, 1))
+
+# Sales and sign-ups are spread over the two years before this date
+END_DATE = datetime.date(2024, 12, 31)
+DAYS = 730
+
+
+def weighted(rnd, options, k):
+    values, weights = zip(*options)
+    return rnd.choices(values, weights=weights, k=k)
+
+
+def day_strings():
+    return [(END_DATE - datetime.timedelta(days=offset)).isoformat() for offset in range(DAYS)]
+
+
+def generate_users(rnd, first_id, count):
+    days = day_strings()
+    for start in range(first_id, first_id + count, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, first_id + count))
+        n = len(ids)
+        created = rnd.choices(days, k=n)
+        logins = rnd.choices(days, k=n)
+        yield list(zip(
+            ids,
+            [f"user{i}" for i in ids],
+            [f"pw{rnd.getrandbits(32):08x}" for _ in ids],
+            [f"user{i}@example.com" for i in ids],
+            [f"{day} 09:00:00" for day in created],
+            [max(c, l) for c, l in zip(created, logins)],
+            weighted(rnd, STATUSES, n),
+            weighted(rnd, ROLES, n),
+            [f"+1-555-{i % 10000000:07d}" for i in ids],
+            rnd.choices(COUNTRIES, k=n),
+        ))
+
+
+def generate_products(rnd, first_id, count, prices):
+    for start in range(first_id, first_id + count, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, first_id + count))
+        n = len(ids)
+        batch_prices = [round(rnd.uniform(5, 1500), 2) for _ in ids]
+        prices.extend(batch_prices)
+        yield list(zip(
+            ids,
+            [f"{a} {b} {i}" for a, b, i in zip(rnd.choices(ADJECTIVES, k=n), rnd.choices(NOUNS, k=n), ids)],
+            [f"{a.capitalize()} and {b} {c.lower()}" for a, b, c in
+             zip(rnd.choices(FEATURES, k=n), rnd.choices(FEATURES, k=n), rnd.choices(NOUNS, k=n))],
+            batch_prices,
+            weighted(rnd, CATEGORIES, n),
+        ))
+
+
+def generate_sales(rnd, count, user_count, product_ids, prices):
+    """Sales in id order, with sale dates increasing along with the id as
+    they would in a real table (which also makes the date indexes cheaper
+    to build)"""
+    stamps = [f"{day} {hour:02d}:{minute:02d}:00"
+              for day in reversed(day_strings()) for hour in range(24) for minute in range(0, 60, 15)]
+    product_indexes = range(len(product_ids))
+    for start in range(1, count + 1, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, count + 1))
+        n = len(ids)
+        # This batch's share of the timeline
+        period = stamps[(start - 1) * len(stamps) // count:ids[-1] * len(stamps) // count] or stamps[-1:]
+        dates = rnd.choices(period, k=n)
+        dates.sort()
+        picked = rnd.choices(product_indexes, k=n)
+        quantities = weighted(rnd, QUANTITIES, n)
+        yield list(zip(
+            ids,
+            [int(rnd.random() * user_count) + 1 for _ in ids],
+            [product_ids[p] for p in picked],
+            quantities,
+            [round(prices[p] * q, 2) for p, q in zip(picked, quantities)],
+            dates,
+        ))
+
+
+def insert(conn, table, columns, batches, total):
+    """executemany every batch in one transaction, reporting progress"""
+    started = time.perf_counter()
+    done = 0
+    placeholders = ', '.join('?' * len(columns))
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    with conn:
+        for rows in batches:
+            conn.executemany(statement, rows)
+            done += len(rows)
+            elapsed = time.perf_counter() - started
+            progress(f"{table}: {done:,}/{total:,} rows ({done / elapsed:,.0f} rows/s)")
+    progress(f"{table}: {done:,} rows in {time.perf_counter() - started:.1f}s", end='\n')
+
+
+def progress(message, end='\r'):
+    print(f"{message:<72}", end=end, file=sys.stderr, flush=True)
+
+
+def drop_derived(conn):
+    """Drop the triggers and secondary indexes on the loaded tables.
+
+    Returns their CREATE statements so restore_derived() can put them back.
+    """
+    rows = conn.execute(
+        f"SELECT type, name, sql FROM sqlite_master WHERE type IN ('trigger', 'index') "
+        f"AND sql IS NOT NULL AND tbl_name IN ({', '.join('?' * len(TABLES))})",
+        TABLES
+    ).fetchall()
+    with conn:
+        for kind, name, _ in rows:
+            conn.execute(f"DROP {kind.upper()} {name}")
+    return [(kind, name, sql) for kind, name, sql in rows]
+
+
+def restore_derived(conn, derived):
+    """Rebuild indexes and summaries in bulk, then recreate the triggers"""
+    for kind, name, sql in derived:
+        if kind == 'index':
+            timed(f"index {name}", conn.execute, sql)
+    timed('dashboard_stats', dashboard.rebuild, conn)
+    with conn:
+        timed('products_fts', conn.execute, "INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+        timed('users_fts', conn.execute, "INSERT INTO users_fts (users_fts) VALUES ('rebuild')")
+        # Caches keyed on table versions must not survive the new data
+        conn.execute("UPDATE table_versions SET version = version + 1")
+        for kind, name, sql in derived:
+            if kind == 'trigger':
+                conn.execute(sql)
+
+
+def timed(label, function, *args):
+    started = time.perf_counter()
+    function(*args)
+    progress(f"{label}: {time.perf_counter() - started:.1f}s", end='\n')
+
+
+def build(output, users, products, sales, seed):
+    scratch = output + '.building'
+    for path in (scratch, scratch + '-journal'):
+        if os.path.exists(path):
+            os.remove(path)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(scratch)
+    for name, value in LOAD_PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+    migrations.migrate(conn)
+    migrations.seed(conn)
+    derived = drop_derived(conn)
+
+    rnd = random.Random(seed)
+    first_user = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM users").fetchone()[0]
+    insert(conn, 'users',
+           ('id', 'username', 'password', 'email', 'created_at', 'last_login', 'status', 'role', 'phone', 'country'),
+           generate_users(rnd, first_user, users), users)
+
+    product_ids = []
+    prices = []
+    for product_id, price in conn.execute("SELECT id, price FROM products ORDER BY id"):
+        product_ids.append(product_id)
+        prices.append(price)
+    first_product = (product_ids[-1] + 1) if product_ids else 1
+    product_ids.extend(range(first_product, first_product + products))
+    insert(conn, 'products', ('id', 'name', 'description', 'price', 'category'),
+           generate_products(rnd, first_product, products, prices), products)
+
+    user_count = first_user - 1 + users
+    insert(conn, 'sales', ('id', 'user_id', 'product_id', 'quantity', 'total_price', 'sale_date'),
+           generate_sales(rnd, sales, user_count, product_ids, prices), sales)
+
+    restore_derived(conn, derived)
+    # The app opens the database in WAL mode; switch now while nothing
+    # else has it open
+    conn.execute('PRAGMA locking_mode=NORMAL')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(output + suffix):
+            os.remove(output + suffix)
+    os.replace(scratch, output)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(scratch + suffix):
+            os.replace(scratch + suffix, output + suffix)
+    progress(f"Built {output} in {time.perf_counter() - started:.1f}s", end='\n')
+
+
+def count(value):
+    """Row count argument; accepts 10000000, 10_000_000 or 1e7"""
+    return int(float(value.replace('_', '')))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=count, default=100000)
+    parser.add_argument('--products', type=count, default=10000)
+    parser.add_argument('--sales', type=count, default=1000000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='marketplace.db')
+    args = parser.parse_args(argv)
+    build(args.output, args.users, args.products, args.sales, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,76 +1,862 @@
 import os
-from datetime import datetime
+import sys
+import gzip
+import io
+import json
+import atexit
+import contextlib
+import shutil
+import sqlite3
+import threading
+import time
+from collections import deque
 from flask import request
 
+try:
+    import fcntl
+except ImportError:
+    # No cross-process file locking (Windows): run a single worker process
+    fcntl = None
+
+LOG_HEADER = 'Timestamp,Activity Type,Status,Username,User ID,IP Address,User Agent,Details'
+
+
+class TimestampFormatter:
+    """Formats epoch seconds as log timestamps, at most once per second"""
+
+    __slots__ = ('_cached',)
+
+    def __init__(self):
+        self._cached = (None, None)
+
+    def __call__(self, created):
+        second = int(created)
+        cached = self._cached
+        if cached[0] != second:
+            # Swap in a new (second, text) pair so concurrent readers never
+            # see a second paired with another second's text
+            cached = self._cached = (second, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second)))
+        return cached[1]
+
+
+format_timestamp = TimestampFormatter()
+
+
+class LogEvent:
+    """One activity captured on the request thread.
+
+    Only raw values are stored; the timestamp is formatted and fields are
+    escaped when a sink writes the event.
+    """
+
+    __slots__ = (
+        'created', 'activity_type', 'status', 'username', 'user_id',
+        'ip_address', 'user_agent', 'details', 'additional_info',
+    )
+
+    def __init__(self, activity_type, status, username=None, user_id=None, ip_address=None,
+                 user_agent=None, details=None, additional_info=None, created=None):
+        self.created = time.time() if created is None else created
+        self.activity_type = sys.intern(activity_type)
+        self.status = sys.intern(status)
+        self.username = username
+        self.user_id = user_id
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+        self.details = details
+        self.additional_info = additional_info
+
+    @property
+    def timestamp(self):
+        return format_timestamp(self.created)
+
+    def to_row(self):
+        """Field tuple in log column order, with the timestamp formatted"""
+        return (
+            format_timestamp(self.created), self.activity_type, self.status,
+            self.username, self.user_id, self.ip_address, self.user_agent,
+            self.details, str(self.additional_info) if self.additional_info else None,
+        )
+
+
+def format_log_line(entry):
+    """Render a log row tuple as one CSV line of the log file"""
+    timestamp, activity_type, status, username, user_id, ip_address, user_agent, details, additional_info = entry
+    log_line = (
+        f"{timestamp},{activity_type},{status},"
+        f"{username or 'N/A'},{user_id or 'N/A'},"
+        f"{ip_address or 'N/A'},{user_agent.replace(',', ';') if user_agent else 'N/A'},"
+        f"{details.replace(',', ';') if details else 'N/A'}"
+    )
+    if additional_info:
+        log_line += f",{str(additional_info).replace(',', ';')}"
+    return log_line
+
+
+class RotatingLogFile:
+    """CSV log sink that rolls the log file over into numbered segments.
+
+    The active file is renamed to `<log_file>.N` once it grows past
+    `max_bytes` or its entries belong to an earlier day. Closed segments are
+    gzipped on a background thread and their time ranges are recorded in a
+    JSON manifest so readers can skip segments outside a time window.
+
+    Several worker processes can share one log. Writes hold a shared
+    `<log_file>.lock` (fcntl.flock) and rotation and manifest updates hold
+    it exclusively, so a file is never renamed between a process checking
+    it and appending to it. A process whose open file has been rotated
+    away by another one reopens the path before writing, as
+    logging.handlers.WatchedFileHandler does.
+    """
+
+    def __init__(self, log_file, max_bytes=0, rotate_daily=False, compress=True, backup_count=0, on_error=None):
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.backup_count = backup_count
+        self.on_error = on_error
+        self.manifest_file = log_file + '.manifest.json'
+        self.lock_file = log_file + '.lock'
+
+        self._lock = threading.Lock()
+        self._manifest_lock = threading.Lock()
+        self._compressors = []
+        # flock locks belong to an open file description, so threads of
+        # this process that lock concurrently each need their own. Writers
+        # share this one under self._lock; other threads open a new one.
+        self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644) if fcntl else None
+        with self._locked(exclusive=True):
+            self._open()
+        atexit.register(self.close)
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive=False, fd=None):
+        if fcntl:
+            own = fd is None
+            if own:
+                fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            if exclusive:
+                with self._manifest_lock:
+                    yield
+            else:
+                yield
+        finally:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                if own:
+                    os.close(fd)
+
+    def _moved(self):
+        """Whether the open file is no longer the one at log_file"""
+        try:
+            current = os.stat(self.log_file)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(self._file.fileno())
+        return (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+
+    def _reopen(self):
+        self._file.close()
+        self._open()
+
+    def _open(self):
+        new_file = not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0
+        self._file = open(self.log_file, 'a')
+        if new_file:
+            self._file.write(LOG_HEADER + '\n')
+            self._file.flush()
+        self._size = self._file.tell()
+        self._first_ts = None
+        self._last_ts = None
+        if not new_file:
+            # Recover the time range of entries already in the file
+            with open(self.log_file, 'r') as f:
+                f.readline()
+                first = f.readline()
+            self._first_ts = first[:19] or None
+            last, _ = read_tail_lines(self.log_file, 1)
+            if last and not last[0].startswith(LOG_HEADER):
+                self._last_ts = last[0][:19]
+
+    def write_entries(self, events):
+        self.write_lines([format_log_line(event.to_row()) for event in events])
+
+    def write_lines(self, lines):
+        with self._lock:
+            if self._file.closed:
+                raise ValueError('log file is closed')
+            if self._should_rotate(lines[0][:19]):
+                with self._locked(exclusive=True, fd=self._lock_fd):
+                    # Another process may have rotated first or appended
+                    # since; decide again on what is on disk
+                    self._reopen()
+                    if self._should_rotate(lines[0][:19]):
+                        self._rotate()
+            with self._locked(fd=self._lock_fd):
+                if self._moved():
+                    self._reopen()
+                self._file.write('\n'.join(lines) + '\n')
+                self._file.flush()
+                self._size = os.fstat(self._file.fileno()).st_size
+            if self._first_ts is None:
+                self._first_ts = lines[0][:19]
+            self._last_ts = lines[-1][:19]
+
+    def _should_rotate(self, timestamp):
+        if self._first_ts is None:
+            return False
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return self.rotate_daily and timestamp[:10] != self._first_ts[:10]
+
+    def rotate(self):
+        """Close the active file as a new segment and start a fresh one"""
+        with self._lock, self._locked(exclusive=True, fd=self._lock_fd):
+            self._reopen()
+            if self._first_ts is not None:
+                self._rotate()
+
+    def _rotate(self):
+        # Called holding the exclusive lock, with the file just reopened so
+        # its time range covers every process's entries. Only a rename and
+        # a reopen happen here; compression of the closed segment is left to
+        # a background thread
+        self._file.close()
+        manifest = self._read_manifest()
+        number = max([seg['number'] for seg in manifest] or [0]) + 1
+        segment = {
+            'number': number,
+            'file': f"{self.log_file}.{number}",
+            'first': self._first_ts,
+            'last': self._last_ts,
+        }
+        os.replace(self.log_file, segment['file'])
+        manifest.append(segment)
+        expired = manifest[:-self.backup_count] if self.backup_count else []
+        manifest = manifest[len(expired):]
+        self._write_manifest(manifest)
+        self._open()
+
+        for seg in expired:
+            for path in (seg['file'], seg['file'] + '.gz'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        if self.compress:
+            thread = threading.Thread(target=self._compress_segment, args=(number,), name='activity-log-compressor', daemon=True)
+            self._compressors = [t for t in self._compressors if t.is_alive()]
+            self._compressors.append(thread)
+            thread.start()
+
+    def _compress_segment(self, number):
+        src = f"{self.log_file}.{number}"
+        dst = src + '.gz'
+        try:
+            with open(src, 'rb') as f_in, gzip.open(dst + '.tmp', 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.replace(dst + '.tmp', dst)
+            with self._locked(exclusive=True):
+                manifest = self._read_manifest()
+                for seg in manifest:
+                    if seg['number'] == number:
+                        seg['file'] = dst
+                self._write_manifest(manifest)
+                os.remove(src)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_file, 'r') as f:
+                return json.load(f)['segments']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _write_manifest(self, manifest):
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({'segments': manifest}, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    def segments(self, start=None, end=None):
+        """Closed segments overlapping [start, end], newest first"""
+        # The manifest is replaced atomically, so reading needs no lock
+        manifest = self._read_manifest()
+        return [
+            seg for seg in reversed(manifest)
+            if (start is None or (seg['last'] or '') >= start)
+            and (end is None or (seg['first'] or '') <= end)
+        ]
+
+    def tail(self, limit, offset=0):
+        if not limit:
+            # Every entry was asked for, so every segment is read in full
+            lines = []
+            for seg in reversed(self.segments()):
+                lines.extend(read_segment_lines(seg['file']))
+            with open(self.log_file, 'r') as f:
+                # Skip header line
+                lines.extend(f.readlines()[1:])
+            return lines[:-offset] if offset else lines
+
+        wanted = limit + offset
+        lines, _ = read_tail_lines(self.log_file, wanted)
+        if len(lines) < wanted:
+            # Continue into rotated segments, newest first, reading each from
+            # its end so only the lines needed are held in memory
+            for seg in self.segments():
+                older, _ = read_tail_lines(seg['file'], wanted - len(lines))
+                lines = older + lines
+                if len(lines) >= wanted:
+                    break
+        return lines[:-offset] if offset else lines
+
+    def page(self, limit, before=None):
+        """One page of entries ending at the `before` cursor, and the cursor
+        of the next older page (None at the start of the oldest segment).
+
+        A cursor is '<segment>:<offset>', a byte offset into a segment's
+        uncompressed content, or just '<segment>' for the end of it. The
+        active file is numbered as the segment it will become, so cursors
+        stay valid across rotations. Pages continue into older segments.
+        """
+        files = {seg['number']: seg['file'] for seg in self.segments()}
+        active = max(files, default=0) + 1
+        files[active] = self.log_file
+        number, end = active, None
+        if before is not None:
+            segment, _, offset = str(before).partition(':')
+            number, end = int(segment), int(offset) if offset else None
+
+        lines = []
+        while number in files:
+            older, offset = read_tail_lines(files[number], limit - len(lines), end=end)
+            lines = older + lines
+            if offset is not None:
+                return lines, f"{number}:{offset}"
+            # Reached the start of this segment; go on into the previous one
+            number = max((n for n in files if n < number), default=None)
+            end = None
+            if len(lines) >= limit:
+                return lines, None if number is None else str(number)
+        return lines, None
+
+    def between(self, start, end):
+        files = [seg['file'] for seg in reversed(self.segments(start, end))]
+        files.append(self.log_file)
+        for path in files:
+            for line in read_segment_lines(path):
+                if start <= line[:19] <= end:
+                    yield line
+
+    def find(self, username=None, ip_address=None, start=None, end=None, limit=100):
+        # Text logs have no index, so this scans every segment in the window
+        matches = deque(maxlen=limit)
+        for line in self.between(start or '', end or '9999'):
+            fields = line.split(',', 6)
+            if username and fields[3] != username:
+                continue
+            if ip_address and fields[5] != ip_address:
+                continue
+            matches.append(line)
+        return list(matches)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+        for thread in self._compressors:
+            thread.join()
+
+
+class SqliteLogSink:
+    """Log sink that stores entries in an indexed SQLite table.
+
+    Uses the activity_logs table of logs/activity_logs.db in WAL mode so
+    readers are not blocked by the batched inserts of the writer.
+    """
+
+    COLUMNS = 'timestamp, activity_type, status, username, user_id, ip_address, user_agent, details, additional_info'
+
+    def __init__(self, db_file, on_error=None):
+        self.db_file = db_file
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS activity_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME NOT NULL,
+                user_id INTEGER,
+                username TEXT,
+                ip_address TEXT,
+                user_agent TEXT,
+                activity_type TEXT NOT NULL,
+                details TEXT,
+                status TEXT,
+                additional_info TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_activity_logs_timestamp ON activity_logs (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activity_logs_username ON activity_logs (username, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activity_logs_ip ON activity_logs (ip_address, timestamp);
+        ''')
+        self._conn.commit()
+
+    def write_entries(self, events):
+        rows = [event.to_row() for event in events]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO activity_logs ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def _select(self, where='', params=(), limit=None, order='id DESC'):
+        query = f"SELECT id, {self.COLUMNS} FROM activity_logs"
+        if where:
+            query += f" WHERE {where}"
+        query += f" ORDER BY {order}"
+        if limit:
+            query += " LIMIT ?"
+            params = tuple(params) + (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        rows.reverse()
+        return rows
+
+    def tail(self, limit, offset=0):
+        if not limit:
+            rows = self._select()
+            rows = rows[:-offset] if offset else rows
+        else:
+            rows = self._select(limit=limit + offset)
+            rows = rows[:max(0, len(rows) - offset)]
+        return [format_log_line(row[1:]) + '\n' for row in rows]
+
+    def page(self, limit, before=None):
+        # The cursor is the id of the oldest entry on the current page
+        if before is None:
+            rows = self._select(limit=limit)
+        else:
+            rows = self._select('id < ?', (int(before),), limit=limit)
+        cursor = rows[0][0] if len(rows) == limit and rows[0][0] > 1 else None
+        return [format_log_line(row[1:]) + '\n' for row in rows], cursor
+
+    def between(self, start, end):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM activity_logs WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id",
+                (start, end)
+            ).fetchall()
+        for row in rows:
+            yield format_log_line(row) + '\n'
+
+    def find(self, username=None, ip_address=None, start=None, end=None, limit=100):
+        conditions, params = [], []
+        if username:
+            conditions.append('username = ?')
+            params.append(username)
+        if ip_address:
+            conditions.append('ip_address = ?')
+            params.append(ip_address)
+        if start:
+            conditions.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            conditions.append('timestamp <= ?')
+            params.append(end)
+        # Ordering by timestamp lets the (username|ip_address, timestamp)
+        # indexes serve both the filter and the sort
+        rows = self._select(' AND '.join(conditions), params, limit=limit, order='timestamp DESC, id DESC')
+        return [format_log_line(row[1:]) + '\n' for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_segment(path, text=False):
+    """Open a log segment for reading, which may be gzipped"""
+    if not os.path.exists(path) and os.path.exists(path + '.gz'):
+        # Compressed since the manifest was read
+        path += '.gz'
+    opener = gzip.open if path.endswith('.gz') else open
+    if text:
+        return opener(path, 'rt', encoding='utf-8', errors='replace')
+    return opener(path, 'rb')
+
+
+def read_segment_lines(path):
+    """All entries of a log segment, which may be gzipped"""
+    with open_segment(path, text=True) as f:
+        return [line for line in f if not line.startswith(LOG_HEADER)]
+
+
+class BufferedLogWriter:
+    """Queues log entries in memory and writes them to the sink in batches.
+
+    Entries are appended to a bounded queue on the caller's thread and a
+    dedicated writer thread drains it into the sink. When the queue is full
+    the `overflow` policy decides what happens to a new entry:
+
+    - 'block': wait until the writer has made room
+    - 'drop_oldest': discard the oldest queued entry to make room
+    - 'drop_newest': discard the new entry
+
+    stats() accounts for every entry passed to write() exactly once:
+    received = pending + written + dropped + failed, apart from a batch
+    that is being written at that moment.
+
+    - received: entries passed to write()
+    - pending: entries in the queue waiting for the writer
+    - written: entries the sink accepted
+    - dropped: entries discarded by the overflow policy, whether the new
+      entry (drop_newest) or a queued one (drop_oldest)
+    - failed: entries in batches the sink raised on; they are not retried
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+    def __init__(self, sink, buffer_size=10000, flush_size=100, flush_interval=1.0, overflow='block', on_error=None):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.on_error = on_error
+
+        self.received = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._pending = deque()
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, log_entry):
+        with self._lock:
+            if self._closed:
+                raise ValueError('log writer is closed')
+            self.received += 1
+            if len(self._pending) >= self.buffer_size:
+                if self.overflow == 'drop_newest':
+                    self.dropped += 1
+                    return
+                if self.overflow == 'drop_oldest':
+                    self._pending.popleft()
+                    self.dropped += 1
+                else:
+                    self._not_empty.notify()
+                    while len(self._pending) >= self.buffer_size and not self._closed:
+                        self._not_full.wait()
+            self._pending.append(log_entry)
+            if len(self._pending) >= self.flush_size:
+                self._not_empty.notify()
+
+    def _drain(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._not_full.notify_all()
+        return batch
+
+    def flush(self):
+        with self._write_lock:
+            batch = self._drain()
+            if not batch:
+                return
+            try:
+                self.sink.write_entries(batch)
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                if self.on_error:
+                    self.on_error(e)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'received': self.received,
+                'pending': len(self._pending),
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+            }
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self.flush_size:
+                    self._not_empty.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        self._thread.join()
+        self.flush()
+
+
 class ActivityLogger:
     def __init__(self, app=None):
         self.app = app
+        self._writer = None
         if app is not None:
             self.init_app(app)
 
     def init_app(self, app):
+        self.app = app
+        self._writer = None
+
         # Ensure the logs directory exists
         if not os.path.exists('logs'):
             os.makedirs('logs')
         
-        # Create logs file if it doesn't exist
         self.log_file = 'logs/logs.txt'
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w') as f:
-                f.write('Timestamp,Activity Type,Status,Username,User ID,IP Address,User Agent,Details\n')
+        self.sink_type = app.config.get('ACTIVITY_LOG_SINK', 'csv')
+        if self.sink_type == 'sqlite':
+            self._sink = SqliteLogSink(
+                app.config.get('ACTIVITY_LOG_DB', 'logs/activity_logs.db'),
+                on_error=self._log_write_error
+            )
+        elif self.sink_type == 'csv':
+            # Open the logs file, creating it if it doesn't exist. Rotation is
+            # off unless a size limit or daily rotation is configured
+            self._sink = RotatingLogFile(
+                self.log_file,
+                max_bytes=app.config.get('ACTIVITY_LOG_MAX_BYTES', 0),
+                rotate_daily=app.config.get('ACTIVITY_LOG_ROTATE_DAILY', False),
+                compress=app.config.get('ACTIVITY_LOG_COMPRESS', True),
+                backup_count=app.config.get('ACTIVITY_LOG_BACKUP_COUNT', 0),
+                on_error=self._log_write_error
+            )
+        else:
+            raise ValueError(f"Unknown ACTIVITY_LOG_SINK: {self.sink_type}")
+
+        # Buffered mode takes sink writes off the request thread: log calls
+        # only enqueue the entry and a background thread writes batches
+        if app.config.get('ACTIVITY_LOG_BUFFERED', False):
+            self._writer = BufferedLogWriter(
+                self._sink,
+                buffer_size=app.config.get('ACTIVITY_LOG_BUFFER_SIZE', 10000),
+                flush_size=app.config.get('ACTIVITY_LOG_FLUSH_SIZE', 100),
+                flush_interval=app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0),
+                overflow=app.config.get('ACTIVITY_LOG_OVERFLOW', 'block'),
+                on_error=self._log_write_error
+            )
+
+    def _log_write_error(self, e):
+        if self.app:
+            self.app.logger.error(f"Failed to write to log file: {str(e)}")
+
+    def flush(self):
+        """Write out any buffered log entries"""
+        if self._writer:
+            self._writer.flush()
+
+    def stats(self):
+        """Entry counters of the buffered writer (see BufferedLogWriter), or
+        None when logging is not buffered"""
+        if self._writer:
+            return self._writer.stats()
+        return None
+
+    def close(self):
+        """Flush buffered log entries and release the log sink"""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        self._sink.close()
+
+    def _write_log(self, event):
+        if self._writer:
+            try:
+                self._writer.write(event)
+            except Exception as e:
+                self._log_write_error(e)
+            return
 
-    def _write_log(self, log_entry):
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry + '\n')
+            self._sink.write_entries([event])
         except Exception as e:
-            if self.app:
-                self.app.logger.error(f"Failed to write to log file: {str(e)}")
+            self._log_write_error(e)
 
     def log_activity(self, activity_type, details, status='success', user_id=None, username=None, request=None, additional_info=None):
         """Log general user activities"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ip_address = request.remote_addr if request else 'N/A'
-        user_agent = request.headers.get('User-Agent') if request else 'N/A'
-        
-        log_entry = (
-            f"{timestamp},{activity_type},{status},"
-            f"{username or 'N/A'},{user_id or 'N/A'},"
-            f"{ip_address},{user_agent.replace(',', ';') if user_agent else 'N/A'},"
-            f"{details.replace(',', ';') if details else 'N/A'}"
-        )
-        
-        if additional_info:
-            log_entry += f",{str(additional_info).replace(',', ';')}"
-        
-        self._write_log(log_entry)
+        if request:
+            ip_address = request.remote_addr
+            user_agent = request.environ.get('HTTP_USER_AGENT')
+        else:
+            ip_address = user_agent = None
+
+        self._write_log(LogEvent(
+            activity_type, status, username, user_id,
+            ip_address, user_agent, details, additional_info
+        ))
 
     def log_login_attempt(self, username, status, request, details=None):
         """Log user login attempts"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ip_address = request.remote_addr if request else 'N/A'
-        user_agent = request.headers.get('User-Agent') if request else 'N/A'
-        
-        log_entry = (
-            f"{timestamp},login_attempt,{status},"
-            f"{username or 'N/A'},N/A,"
-            f"{ip_address},{user_agent.replace(',', ';') if user_agent else 'N/A'},"
-            f"{details.replace(',', ';') if details else 'N/A'}"
-        )
-        
-        self._write_log(log_entry)
+        if request:
+            ip_address = request.remote_addr
+            user_agent = request.environ.get('HTTP_USER_AGENT')
+        else:
+            ip_address = user_agent = None
 
-    def get_activity_logs(self, limit=100):
-        """Retrieve recent activity logs"""
+        self._write_log(LogEvent(
+            'login_attempt', status, username, None,
+            ip_address, user_agent, details
+        ))
+
+    def get_activity_logs(self, limit=100, offset=0):
+        """Retrieve recent activity logs, skipping the newest `offset` entries"""
+        self.flush()
         try:
-            with open(self.log_file, 'r') as f:
-                # Skip header line
-                lines = f.readlines()[1:]
-                return lines[-limit:] if limit else lines
+            return self._sink.tail(limit, offset)
         except Exception as e:
             if self.app:
                 self.app.logger.error(f"Failed to read log file: {str(e)}")
             return []
 
+    def get_activity_logs_page(self, limit=100, before=None):
+        """Retrieve one page of logs ending at the `before` cursor.
+
+        Returns the entries and the cursor for the next older page, or None
+        once the start of the log has been reached. Cursors are opaque and
+        round-trip through a query string.
+        """
+        self.flush()
+        try:
+            return self._sink.page(limit, before)
+        except Exception as e:
+            if self.app:
+                self.app.logger.error(f"Failed to read log file: {str(e)}")
+            return [], None
+
+    def read_logs_between(self, start, end):
+        """Yield entries with timestamps in [start, end], oldest first.
+
+        Timestamps are 'YYYY-MM-DD HH:MM:SS' strings. Rotated segments whose
+        recorded time range falls outside the window are never opened.
+        """
+        self.flush()
+        return self._sink.between(start, end)
+
+    def find_activity_logs(self, username=None, ip_address=None, start=None, end=None, limit=100):
+        """Retrieve the most recent logs matching a user, IP and time window"""
+        self.flush()
+        try:
+            return self._sink.find(username, ip_address, start, end, limit)
+        except Exception as e:
+            if self.app:
+                self.app.logger.error(f"Failed to read log file: {str(e)}")
+            return []
+
+
+def read_tail_lines(path, limit, end=None, block_size=65536):
+    """Read up to `limit` lines ending before byte offset `end`.
+
+    Plain files are read backwards one block at a time, so memory depends
+    on `limit` and not on the size of the file. Gzipped segments cannot
+    seek backwards without decompressing from the start each time, so they
+    are decompressed once, forwards, keeping only the chunks that hold the
+    last `limit` lines; offsets are into the uncompressed content. Returns the lines oldest
+    first and the byte offset of the oldest returned line (None at start
+    of file).
+    """
+    with open_segment(path) as f:
+        if isinstance(f, gzip.GzipFile):
+            lines, cursor = _tail_lines_forwards(f, limit, end)
+        else:
+            lines, cursor = _tail_lines_backwards(f, limit, end, block_size)
+    return [line.decode('utf-8', errors='replace') for line in lines], cursor
+
+
+def _tail_lines_backwards(f, limit, end, block_size):
+    lines = []
+    size = f.seek(0, os.SEEK_END)
+    pos = size if end is None else max(0, min(end, size))
+    buf = b''
+    cut = 0
+    while len(lines) < limit:
+        # Newline terminating the line before the one ending at `cut`
+        nl = buf.rfind(b'\n', 0, cut - 1) if cut > 1 else -1
+        if nl != -1:
+            lines.append(buf[nl + 1:cut])
+            cut = nl + 1
+            continue
+        if pos == 0:
+            # Whatever is left is the first line of the file
+            if cut and not buf.startswith(LOG_HEADER.encode()):
+                lines.append(buf[:cut])
+            cut = 0
+            break
+        read_size = min(block_size, pos)
+        pos -= read_size
+        f.seek(pos)
+        buf = f.read(read_size) + buf[:cut]
+        cut = len(buf)
+
+    cursor = pos + cut
+    if cursor == 0 or (pos == 0 and buf[:cut] == LOG_HEADER.encode() + b'\n'):
+        cursor = None
+    lines.reverse()
+    return lines, cursor
+
+
+def _tail_lines_forwards(f, limit, end, chunk_size=1024 * 1024):
+    # Decompress in chunks, dropping the oldest chunk whenever the chunks
+    # after it (bar the newest, which may still be cut at `end`) hold more
+    # than `limit` newlines, then read the rest backwards in memory
+    chunks = deque()
+    newlines = deque()
+    kept = 0
+    base = 0
+    size = 0
+    while end is None or size < end:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        if end is not None:
+            chunk = chunk[:end - size]
+        size += len(chunk)
+        chunks.append(chunk)
+        newlines.append(chunk.count(b'\n'))
+        kept += newlines[-1]
+        while len(chunks) > 2 and kept - newlines[0] - newlines[-1] > limit:
+            base += len(chunks.popleft())
+            kept -= newlines.popleft()
+    content = b''.join(chunks)
+    lines, cursor = _tail_lines_backwards(io.BytesIO(content), limit, None, max(len(content), 1))
+    if base and cursor is not None:
+        cursor += base
+    return lines, cursor
+
+
 # Initialize the logger
 activity_logger = ActivityLogger()
\ No newline at end of file
@@ -1,67 +1,34 @@
 from flask import Flask, request, redirect, session, render_template_string, g
 import os
 import sqlite3
+from db_pool import ConnectionPool
+import migrations
+import catalog
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
 # Database setup
+db_pool = ConnectionPool('marketplace.db')
+
 def get_db():
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect('marketplace.db')
-        db.row_factory = sqlite3.Row
+        db = g._database = db_pool.acquire()
     return db
 
 @app.teardown_appcontext
 def close_connection(exception):
-    db = getattr(g, '_database', None)
+    db = g.pop('_database', None)
     if db is not None:
-        db.close()
+        db_pool.release(db)
 
 def init_db():
     with app.app_context():
         db = get_db()
-        cursor = db.cursor()
-        
-        # Create products table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products 
-        (id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL, category TEXT)
-        ''')
-        
-        # Create users table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users 
-        (id INTEGER PRIMARY KEY, username TEXT, password TEXT)
-        ''')
-        
-        # Add sample products
-        cursor.execute("DELETE FROM products")
-        products = [
-            (1, "Smartphone X", "Latest smartphone with amazing features", 899.99, "Electronics"),
-            (2, "Laptop Pro", "Professional laptop for developers", 1299.99, "Electronics"),
-            (3, "Coffee Maker", "Automatic coffee maker", 89.99, "Appliances"),
-            (4, "Blender", "High-speed blender", 49.99, "Appliances"),
-            (5, "Running Shoes", "Comfortable shoes for runners", 79.99, "Clothing"),
-            (6, "T-shirt", "Cotton t-shirt", 19.99, "Clothing"),
-            (7, "Headphones", "Noise-cancelling headphones", 199.99, "Electronics"),
-            (8, "Smart Watch", "Fitness tracking watch", 149.99, "Electronics"),
-            (9, "Toaster", "2-slice toaster", 29.99, "Appliances"),
-            (10, "Jeans", "Classic blue jeans", 59.99, "Clothing")
-        ]
-        cursor.executemany("INSERT INTO products VALUES (?, ?, ?, ?, ?)", products)
-        
-        # Add users
-        cursor.execute("DELETE FROM users")
-        users = [
-            (1, "administrator", "c4ptain5ecur3"),
-            (2, "user1", "password123"),
-            (3, "guest", "guest")
-        ]
-        cursor.executemany("INSERT INTO users VALUES (?, ?, ?)", users)
-        
-        db.commit()
+        migrations.migrate(db)
+        migrations.seed(db)
+        catalog.invalidate()
 
 LOGIN_TEMPLATE = """
 <!DOCTYPE html>
@@ -223,6 +190,17 @@ MARKETPLACE_TEMPLATE = """
             border: 1px solid #ddd;
             border-radius: 5px;
         }
+        .pagination {
+            display: flex;
+            justify-content: center;
+            gap: 15px;
+            margin-top: 20px;
+        }
+        .pagination a {
+            color: #4CAF50;
+            text-decoration: none;
+            font-weight: 600;
+        }
     </style>
 </head>
 <body>
@@ -279,6 +257,16 @@ MARKETPLACE_TEMPLATE = """
             <pre>{{ query_executed }}</pre>
         </div>
     {% endif %}
+    {% if prev_before or next_after %}
+        <div class="pagination">
+            {% if prev_before %}
+                <a href="{{ url_for('marketplace', category=selected_category or None, before=prev_before, page_size=page_size) }}">&laquo; Previous</a>
+            {% endif %}
+            {% if next_after %}
+                <a href="{{ url_for('marketplace', category=selected_category or None, after=next_after, page_size=page_size) }}">Next &raquo;</a>
+            {% endif %}
+        </div>
+    {% endif %}
 </body>
 </html>
 """
@@ -421,23 +409,22 @@ def marketplace():
     # Get selected category filter
     category = request.args.get('category', '')
     
-    db = get_db()
-    cursor = db.cursor()
-    
-    # Vulnerable code - SQL Injection in category filter
-    query = "SELECT name, description, price, category FROM products"
-    
-    if category:
-        # This is where the vulnerability exists - direct string concatenation
-        query += f" WHERE category = '{category}'"
+    # Keyset pagination cursors: product ids bounding the neighbouring pages
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+    page_size = request.args.get('page_size', catalog.DEFAULT_PAGE_SIZE, type=int)
     
     show_debug = 'debug' in request.args
+    if before is not None:
+        query = catalog.PRODUCTS_BY_CATEGORY_BEFORE_QUERY if category else catalog.PRODUCTS_BEFORE_QUERY
+    else:
+        query = catalog.PRODUCTS_BY_CATEGORY_QUERY if category else catalog.PRODUCTS_QUERY
     
     try:
-        cursor.execute(query)
-        products = cursor.fetchall()
+        products, next_after, prev_before = catalog.list_products(
+            get_db(), category, after=after, before=before, page_size=page_size
+        )
     except sqlite3.Error as e:
-        # This allows SQL errors to be shown to the user, aiding in SQL injection development
         return f"SQL Error: {str(e)}<br><a href='/marketplace'>Go back</a>"
     
     username = session.get('username')
@@ -445,6 +432,9 @@ def marketplace():
         MARKETPLACE_TEMPLATE, 
         products=products, 
         selected_category=category,
+        next_after=next_after,
+        prev_before=prev_before,
+        page_size=page_size,
         username=username,
         show_debug='debug' in request.args,
         query_executed=query if show_debug else None
@@ -0,0 +1,362 @@
+import sqlite3
+import sys
+
+
+def add_columns(table, columns):
+    """Migration step adding the columns a table does not have yet.
+
+    Databases created outside these migrations may already have some of
+    them, and ALTER TABLE ADD COLUMN has no IF NOT EXISTS form.
+    """
+    def step(conn):
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    return step
+
+
+def trigger(name, event, statements):
+    body = '\n'.join(statement + ';' for statement in statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event}\nBEGIN\n{body}\nEND"
+
+
+def stat(metric, key, count, total=0, source=None):
+    """Statement adding count and total to one dashboard_stats row"""
+    values = f"SELECT '{metric}', {key}, {count}, {total} {source}" if source else f"VALUES ('{metric}', {key}, {count}, {total})"
+    return (
+        f"INSERT INTO dashboard_stats (metric, key, count, total) {values} "
+        "ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count, total = total + excluded.total"
+    )
+
+
+def sales_stats(row, sign=1):
+    """dashboard_stats updates for one sales row (NEW or OLD).
+
+    count is the number of sales for the 'sales' and 'month' rows and the
+    number of units sold for the 'product' and 'category' rows.
+    """
+    minus = '-' if sign < 0 else ''
+    price = f"{minus}COALESCE({row}.total_price, 0)"
+    quantity = f"{minus}COALESCE({row}.quantity, 0)"
+    return [
+        stat('sales', "''", f"{minus}1", price),
+        stat('month', f"COALESCE(strftime('%Y-%m', {row}.sale_date), '')", f"{minus}1", price),
+        stat('product', f"{row}.product_id", quantity, price),
+        stat('category', "COALESCE(category, '')", quantity, price,
+             f"FROM products WHERE id = {row}.product_id"),
+    ]
+
+
+def product_category_stats(row, sign=1):
+    """Add (or with sign -1 remove) the units and revenue counted under
+    product {row}.id to its category"""
+    minus = '-' if sign < 0 else ''
+    return stat('category', f"COALESCE({row}.category, '')", f'{minus}count', f'{minus}total',
+                f"FROM dashboard_stats WHERE metric = 'product' AND key = {row}.id")
+
+
+def user_stats(row, sign=1, total=True):
+    minus = '-' if sign < 0 else ''
+    statements = [
+        stat('status', f"COALESCE({row}.status, '')", f"{minus}1"),
+        stat('role', f"COALESCE({row}.role, '')", f"{minus}1"),
+    ]
+    if total:
+        statements.append(stat('users', "''", f"{minus}1"))
+    return statements
+
+
+def fts_triggers(table, columns):
+    """Triggers keeping the external-content FTS5 table {table}_fts in sync"""
+    fts = f"{table}_fts"
+    names = ', '.join(columns)
+    new_values = ', '.join(f"NEW.{column}" for column in columns)
+    old_values = ', '.join(f"OLD.{column}" for column in columns)
+    insert = f"INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new_values})"
+    delete = f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old_values})"
+    return [
+        trigger(f"{fts}_insert", f"INSERT ON {table}", [insert]),
+        trigger(f"{fts}_delete", f"DELETE ON {table}", [delete]),
+        trigger(f"{fts}_update", f"UPDATE OF {names} ON {table}", [delete, insert]),
+    ]
+
+
+# Recomputes dashboard_stats from scratch; run once by migration 5 and by
+# dashboard.rebuild() after bulk loads
+DASHBOARD_BACKFILL = [
+    """
+    INSERT INTO dashboard_stats (metric, key, count, total)
+    SELECT 'users', '', COUNT(*), 0 FROM users
+    UNION ALL SELECT 'products', '', COUNT(*), 0 FROM products
+    UNION ALL SELECT 'sales', '', COUNT(*), COALESCE(SUM(total_price), 0) FROM sales
+    """,
+    """
+    INSERT INTO dashboard_stats (metric, key, count, total)
+    SELECT 'status', COALESCE(status, ''), COUNT(*), 0 FROM users GROUP BY 2
+    UNION ALL SELECT 'role', COALESCE(role, ''), COUNT(*), 0 FROM users GROUP BY 2
+    """,
+    """
+    INSERT INTO dashboard_stats (metric, key, count, total)
+    SELECT 'month', COALESCE(strftime('%Y-%m', sale_date), ''), COUNT(*), SUM(COALESCE(total_price, 0))
+    FROM sales GROUP BY strftime('%Y-%m', sale_date)
+    """,
+    """
+    INSERT INTO dashboard_stats (metric, key, count, total)
+    SELECT 'product', product_id, SUM(COALESCE(quantity, 0)), SUM(COALESCE(total_price, 0))
+    FROM sales WHERE product_id IS NOT NULL GROUP BY product_id
+    """,
+    """
+    INSERT INTO dashboard_stats (metric, key, count, total)
+    SELECT 'category', COALESCE(p.category, ''), SUM(COALESCE(s.quantity, 0)), SUM(COALESCE(s.total_price, 0))
+    FROM sales s JOIN products p ON p.id = s.product_id GROUP BY 2
+    """,
+]
+
+
+# Ordered schema migrations as (version, description, statements). Each one
+# is applied once and recorded in schema_version; never edit an applied
+# migration, add a new one instead.
+MIGRATIONS = [
+    (1, 'create products and users tables', [
+        '''
+        CREATE TABLE IF NOT EXISTS products
+        (id INTEGER PRIMARY KEY, name TEXT, description TEXT, price REAL, category TEXT)
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS users
+        (id INTEGER PRIMARY KEY, username TEXT, password TEXT)
+        ''',
+    ]),
+    (2, 'index products by category and price', [
+        'CREATE INDEX IF NOT EXISTS idx_products_category ON products (category)',
+        'CREATE INDEX IF NOT EXISTS idx_products_price ON products (price)',
+    ]),
+    (3, 'track products and users table versions', [
+        '''
+        CREATE TABLE IF NOT EXISTS table_versions
+        (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)
+        ''',
+        "INSERT OR IGNORE INTO table_versions (name) VALUES ('products'), ('users')",
+    ] + [
+        # Every write to a tracked table bumps its version, so caches keyed
+        # on the version never serve data from before the write
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+        END
+        '''
+        for table in ('products', 'users')
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]),
+    (4, 'add user profile columns and the sales table', [
+        add_columns('users', [
+            ('email', 'TEXT'),
+            ('created_at', 'TEXT'),
+            ('last_login', 'TEXT'),
+            ('status', "TEXT DEFAULT 'active'"),
+            ('role', "TEXT DEFAULT 'customer'"),
+            ('phone', 'TEXT'),
+            ('country', 'TEXT'),
+        ]),
+        '''
+        CREATE TABLE IF NOT EXISTS sales
+        (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users (id),
+         product_id INTEGER REFERENCES products (id), quantity INTEGER NOT NULL DEFAULT 1,
+         total_price REAL NOT NULL DEFAULT 0, sale_date TEXT NOT NULL)
+        ''',
+        "INSERT OR IGNORE INTO table_versions (name) VALUES ('sales')",
+    ] + [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS sales_version_{event.lower()} AFTER {event} ON sales
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = 'sales';
+        END
+        '''
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]),
+    (5, 'materialize admin dashboard statistics', [
+        '''
+        CREATE TABLE IF NOT EXISTS dashboard_stats
+        (metric TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL DEFAULT 0,
+         total REAL NOT NULL DEFAULT 0, PRIMARY KEY (metric, key))
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_dashboard_stats_count ON dashboard_stats (metric, count)',
+        trigger('sales_stats_insert', 'INSERT ON sales', sales_stats('NEW')),
+        trigger('sales_stats_delete', 'DELETE ON sales', sales_stats('OLD', -1)),
+        trigger('sales_stats_update', 'UPDATE ON sales', sales_stats('OLD', -1) + sales_stats('NEW')),
+        trigger('users_stats_insert', 'INSERT ON users', user_stats('NEW')),
+        trigger('users_stats_delete', 'DELETE ON users', user_stats('OLD', -1)),
+        trigger('users_stats_update', 'UPDATE OF status, role ON users',
+                user_stats('OLD', -1, total=False) + user_stats('NEW', total=False)),
+        trigger('products_stats_insert', 'INSERT ON products', [stat('products', "''", 1)]),
+        trigger('products_stats_delete', 'DELETE ON products', [stat('products', "''", -1)]),
+        # Sales already counted under a product follow it to its new category
+        trigger('products_stats_update', 'UPDATE OF category ON products', [
+            stat('category', "COALESCE(OLD.category, '')", '-count', '-total',
+                 "FROM dashboard_stats WHERE metric = 'product' AND key = OLD.id"),
+            stat('category', "COALESCE(NEW.category, '')", 'count', 'total',
+                 "FROM dashboard_stats WHERE metric = 'product' AND key = OLD.id"),
+        ]),
+    ] + DASHBOARD_BACKFILL),
+    (6, 'index sales and users for the dashboard queries', [
+        # Recent sales, newest first
+        'CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales (sale_date)',
+        'CREATE INDEX IF NOT EXISTS idx_sales_user ON sales (user_id)',
+        # Covers the per-product and per-category rollups
+        'CREATE INDEX IF NOT EXISTS idx_sales_product ON sales (product_id, quantity, total_price)',
+        # Monthly rollup; only used by queries that group on this exact expression
+        "CREATE INDEX IF NOT EXISTS idx_sales_month ON sales (strftime('%Y-%m', sale_date), total_price)",
+        # Newest users first on the dashboard
+        'CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at)',
+    ]),
+    (7, 'index users for the filtered admin listing', [
+        # Equality filters, each followed by id for the newest-first order
+        'CREATE INDEX IF NOT EXISTS idx_users_status ON users (status, id)',
+        'CREATE INDEX IF NOT EXISTS idx_users_role ON users (role, id)',
+        'CREATE INDEX IF NOT EXISTS idx_users_status_role ON users (status, role, id)',
+        # Prefix search; also serves login and registration lookups by username
+        'CREATE INDEX IF NOT EXISTS idx_users_username ON users (username)',
+        'CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)',
+    ]),
+    (8, 'full-text search over products and users', [
+        # External-content FTS5 tables: the text lives only in products and
+        # users, the index is kept in sync by the triggers below. The prefix
+        # option adds 2- and 3-character prefix indexes so "lap*" is a
+        # direct lookup rather than a scan of every term starting with it.
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5
+        (name, description, category, content='products', content_rowid='id',
+         tokenize='unicode61 remove_diacritics 2', prefix='2 3')
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5
+        (username, email, content='users', content_rowid='id',
+         tokenize='unicode61 remove_diacritics 2', prefix='2 3')
+        ''',
+    ] + [
+        statement
+        for table, columns in (('products', ('name', 'description', 'category')), ('users', ('username', 'email')))
+        for statement in fts_triggers(table, columns)
+    ] + [
+        "INSERT INTO products_fts (products_fts) VALUES ('rebuild')",
+        "INSERT INTO users_fts (users_fts) VALUES ('rebuild')",
+    ]),
+    (9, 'take deleted products out of the category totals', [
+        # Category totals only count sales of products that exist, as the
+        # backfill's join does. A product's own row is kept, like its
+        # sales, and counts again if the id comes back.
+        'DROP TRIGGER IF EXISTS products_stats_insert',
+        'DROP TRIGGER IF EXISTS products_stats_delete',
+        trigger('products_stats_insert', 'INSERT ON products', [
+            stat('products', "''", 1),
+            product_category_stats('NEW'),
+        ]),
+        trigger('products_stats_delete', 'DELETE ON products', [
+            stat('products', "''", -1),
+            product_category_stats('OLD', -1),
+        ]),
+        # Recount what earlier deletes left behind
+        'DELETE FROM dashboard_stats',
+    ] + DASHBOARD_BACKFILL),
+    (10, 'case-insensitive prefix search in the admin user listing', [
+        # Ranges on `username COLLATE NOCASE` can only use an index with the
+        # same collation; id follows for the cursor order
+        'CREATE INDEX IF NOT EXISTS idx_users_username_nocase ON users (username COLLATE NOCASE, id)',
+        'CREATE INDEX IF NOT EXISTS idx_users_email_nocase ON users (email COLLATE NOCASE, id)',
+        # Only the search used it; idx_users_username stays for logins
+        'DROP INDEX IF EXISTS idx_users_email',
+    ]),
+]
+
+SAMPLE_PRODUCTS = [
+    (1, "Smartphone X", "Latest smartphone with amazing features", 899.99, "Electronics"),
+    (2, "Laptop Pro", "Professional laptop for developers", 1299.99, "Electronics"),
+    (3, "Coffee Maker", "Automatic coffee maker", 89.99, "Appliances"),
+    (4, "Blender", "High-speed blender", 49.99, "Appliances"),
+    (5, "Running Shoes", "Comfortable shoes for runners", 79.99, "Clothing"),
+    (6, "T-shirt", "Cotton t-shirt", 19.99, "Clothing"),
+    (7, "Headphones", "Noise-cancelling headphones", 199.99, "Electronics"),
+    (8, "Smart Watch", "Fitness tracking watch", 149.99, "Electronics"),
+    (9, "Toaster", "2-slice toaster", 29.99, "Appliances"),
+    (10, "Jeans", "Classic blue jeans", 59.99, "Clothing")
+]
+
+SAMPLE_USERS = [
+    (1, "administrator", "c4ptain5ecur3"),
+    (2, "user1", "password123"),
+    (3, "guest", "guest")
+]
+
+
+def current_version(conn):
+    """Schema version of the database, 0 if it was never migrated"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def latest_version():
+    return MIGRATIONS[-1][0]
+
+
+def migrate(conn):
+    """Apply pending migrations, returning the versions that were applied"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version
+    (version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT DEFAULT CURRENT_TIMESTAMP)
+    ''')
+    conn.commit()
+
+    applied = []
+    version = current_version(conn)
+    for number, description, statements in MIGRATIONS:
+        if number <= version:
+            continue
+        with conn:
+            # DDL does not open a transaction implicitly; make it explicit so
+            # a failed migration leaves no partial schema behind
+            conn.execute('BEGIN')
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (number, description)
+            )
+        applied.append(number)
+    return applied
+
+
+def seed(conn):
+    """Insert the sample products and users unless they already exist"""
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO products (id, name, description, price, category) VALUES (?, ?, ?, ?, ?)",
+            SAMPLE_PRODUCTS
+        )
+        conn.executemany("INSERT OR IGNORE INTO users (id, username, password) VALUES (?, ?, ?)", SAMPLE_USERS)
+
+
+def init_db(database='marketplace.db'):
+    conn = sqlite3.connect(database)
+    try:
+        applied = migrate(conn)
+        seed(conn)
+        return applied
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    database = sys.argv[1] if len(sys.argv) > 1 else 'marketplace.db'
+    applied = init_db(database)
+    if applied:
+        print(f"Applied migrations {applied} to {database}")
+    else:
+        print(f"{database} is up to date (schema version {latest_version()})")
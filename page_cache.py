@@ -0,0 +1,63 @@
+import hashlib
+
+from flask import make_response, request
+from markupsafe import Markup
+
+import assets
+import catalog
+import template_registry
+
+# Rendered HTML fragments shared by every user, such as the product grid.
+# Keys should include the catalog table version so writes invalidate them.
+fragment_cache = catalog.ResultCache(max_entries=512, ttl=300.0)
+catalog.on_invalidate(fragment_cache.clear)
+
+
+def cached_fragment(key, render):
+    """Return the cached HTML for `key`, calling `render()` to build it on a miss.
+
+    A key of None renders without caching, for when no table version is
+    available to invalidate the entry.
+    """
+    if key is None:
+        return Markup(render())
+    html = fragment_cache.get(key)
+    if html is None:
+        html = render()
+        fragment_cache.set(key, html)
+    return Markup(html)
+
+
+def content_etag(db, tables, *parts):
+    """ETag built from table versions instead of a hash of the response body.
+
+    `parts` are the other inputs of the page (route, query arguments, user)
+    and are hashed together with the template and asset digests and the
+    versions of `tables`, so computing it costs one small indexed query.
+
+    Returns None if any of `tables` has no version (an unmigrated
+    database), since writes to it would not change the ETag.
+    """
+    versions = catalog.table_versions(db)
+    if any(table not in versions for table in tables):
+        return None
+    key = repr((template_registry.digest, assets.digest, [versions[table] for table in tables], parts))
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def not_modified(etag):
+    """A 304 response if the client already has `etag`, otherwise None"""
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return with_etag(make_response('', 304), etag)
+    return None
+
+
+def with_etag(response, etag):
+    """`response` with `etag` (if there is one) and no shared caching"""
+    response = make_response(response)
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    # Pages depend on the session, so only the browser may cache them and it
+    # must revalidate every time
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import itertools
+
+# Placeholder data for the admin dashboard when the database has nothing to
+# show. Every value is a pure function of the row number, so the same count
+# always produces the same rows and results can be memoized freely.
+
+STATUSES = ('active', 'inactive', 'suspended')
+ROLES = ('customer', 'admin', 'vendor', 'support')
+COUNTRIES = ('US', 'UK', 'CA', 'AU', 'DE', 'FR', 'JP')
+
+USER_COLUMNS = ('id', 'username', 'email', 'created_at', 'last_login', 'status', 'role', 'phone', 'country', 'credit_card')
+
+DEFAULT_BATCH_SIZE = 10000
+
+MONTHLY_SALES = (
+    ('2023-01', 12500),
+    ('2023-02', 15300),
+    ('2023-03', 18200),
+    ('2023-04', 16800),
+    ('2023-05', 19500),
+    ('2023-06', 22100),
+    ('2023-07', 23400),
+    ('2023-08', 25800),
+    ('2023-09', 28900),
+    ('2023-10', 27600),
+    ('2023-11', 30200),
+    ('2023-12', 35400),
+)
+
+CATEGORY_SALES = (
+    ('Electronics', 83500),
+    ('Clothing', 45200),
+    ('Home & Kitchen', 36900),
+    ('Books', 22400),
+    ('Toys', 18700),
+)
+
+TOP_PRODUCTS = (
+    ('Smartphone Pro X', 325),
+    ('Laptop Ultra Slim', 238),
+    ('Wireless Earbuds', 189),
+    ('Smart Watch', 156),
+    ('Bluetooth Speaker', 132),
+)
+
+# Stand-ins for the stats the dashboard computes from real users
+USER_STATS = {
+    'active': 35,
+    'inactive': 10,
+    'suspended': 5,
+    'by_role': {
+        'customer': 40,
+        'admin': 5,
+        'vendor': 5
+    }
+}
+
+
+# Columns that repeat with the id are formatted once per period and then
+# looked up: created_at repeats every 84 ids (lcm of 12 months and 28
+# days), last_login every 30 and the card's last four digits every 9000
+CREATED_AT = tuple(f"2023-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}" for i in range(84))
+LAST_LOGIN = tuple(f"2023-05-{(i % 30) + 1:02d}" for i in range(30))
+CARD_LAST4 = tuple(f"{1000 + i:04d}" for i in range(9000))
+
+
+def user_rows(start, stop):
+    """Sample users with ids start..stop-1, built a column at a time.
+
+    Each column is one comprehension over the id range rather than one
+    tuple assembled per user; with the periodic columns precomputed, the
+    MD5 of the fake card number is most of what is left.
+    """
+    ids = range(start, stop)
+    usernames = [f"user{i}" for i in ids]
+    emails = [f"{username}@example.com" for username in usernames]
+    created_at = [CREATED_AT[i % 84] for i in ids]
+    last_login = [LAST_LOGIN[i % 30] for i in ids]
+    statuses = [STATUSES[i % 3] for i in ids]
+    roles = [ROLES[i % 4] for i in ids]
+    phones = [f"+1-555-{1000 + i}" for i in ids]
+    countries = [COUNTRIES[i % 7] for i in ids]
+    # Realistic-looking but fake Visa numbers, weakly hashed with MD5
+    md5 = hashlib.md5
+    cards = [
+        md5(f"4{m[:3]}-{m[3:7]}-{m[7:11]}-{CARD_LAST4[i % 9000]}".encode()).hexdigest()
+        for i, m in zip(ids, [str(i).zfill(11) for i in ids])
+    ]
+    return list(zip(ids, usernames, emails, created_at, last_login, statuses, roles, phones, countries, cards))
+
+
+@functools.lru_cache(maxsize=16)
+def users(count):
+    """The first `count` sample users, as a tuple shared by every caller"""
+    return tuple(user_rows(1, count + 1))
+
+
+def iter_user_batches(count, batch_size=DEFAULT_BATCH_SIZE, start=1):
+    """`count` sample users as lists of up to `batch_size` rows.
+
+    Memory stays at one batch however many users are requested, so this
+    can feed millions of rows to executemany or a streamed response.
+    """
+    stop = start + count
+    for first in range(start, stop, batch_size):
+        yield user_rows(first, min(first + batch_size, stop))
+
+
+def iter_users(count, batch_size=DEFAULT_BATCH_SIZE, start=1):
+    """`count` sample users one row at a time, generated in batches"""
+    return itertools.chain.from_iterable(iter_user_batches(count, batch_size, start))
+
+
+def monthly_sales():
+    return MONTHLY_SALES
+
+
+def categories():
+    return CATEGORY_SALES
+
+
+def top_products():
+    return TOP_PRODUCTS
+
+
+def user_stats():
+    """A fresh copy, since callers may fill it in"""
+    return {**USER_STATS, 'by_role': dict(USER_STATS['by_role'])}
@@ -0,0 +1,57 @@
+import threading
+
+# Every table with its columns, in one statement
+SCHEMA_QUERY = """
+    SELECT m.name, c.name FROM sqlite_master m JOIN pragma_table_info(m.name) c
+    WHERE m.type = 'table' ORDER BY m.name, c.cid
+"""
+
+
+class SchemaCache:
+    """Table and column names of a database, re-read only when its schema changes.
+
+    SQLite bumps PRAGMA schema_version on every CREATE, ALTER or DROP, from
+    any connection or process. Reading it is a lookup in the database header,
+    so while it is unchanged the cached metadata is returned without
+    touching sqlite_master or running PRAGMA table_info.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def tables(self, db):
+        """{table name: tuple of column names} for the database behind `db`"""
+        version = db.execute('PRAGMA schema_version').fetchone()[0]
+        with self._lock:
+            if version == self.version:
+                self.hits += 1
+                return self._tables
+        tables = {}
+        for table, column in db.execute(SCHEMA_QUERY):
+            tables.setdefault(table, []).append(column)
+        tables = {name: tuple(columns) for name, columns in tables.items()}
+        with self._lock:
+            self.misses += 1
+            self.version = version
+            self._tables = tables
+        return tables
+
+    def has_table(self, db, table):
+        return table in self.tables(db)
+
+    def columns(self, db, table):
+        """Column names of `table`, empty if it does not exist"""
+        return self.tables(db).get(table, ())
+
+    def clear(self):
+        with self._lock:
+            self.version = None
+            self._tables = {}
+
+    def stats(self):
+        with self._lock:
+            return {'schema_version': self.version, 'tables': len(self._tables), 'hits': self.hits, 'misses': self.misses}
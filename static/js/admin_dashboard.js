@@ -0,0 +1,276 @@
+// Chart data rendered into the page by the admin_dashboard template
+var dashboardData = JSON.parse(document.getElementById('dashboard-data').textContent);
+
+// Chart.js is served from static/vendor; if it failed to load, leave a note
+// in place of each chart rather than breaking the rest of the page
+function createChart(canvasId, config) {
+    var canvas = document.getElementById(canvasId);
+    if (typeof Chart === 'undefined') {
+        var note = document.createElement('p');
+        note.className = 'chart-unavailable';
+        note.textContent = 'Chart unavailable';
+        canvas.replaceWith(note);
+        return null;
+    }
+    return new Chart(canvas.getContext('2d'), config);
+}
+
+// Monthly Sales Chart
+var monthlySalesChart = createChart('monthlySalesChart', {
+    type: 'line',
+    data: {
+        labels: dashboardData.monthly_sales.map(function(row) { return row[0]; }),
+        datasets: [{
+            label: 'Total Sales ($)',
+            data: dashboardData.monthly_sales.map(function(row) { return row[1]; }),
+            backgroundColor: 'rgba(76, 175, 80, 0.2)',
+            borderColor: '#4CAF50',
+            borderWidth: 2,
+            tension: 0.3
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true,
+                ticks: {
+                    callback: function(value) {
+                        return '$' + value.toLocaleString();
+                    }
+                }
+            }
+        }
+    }
+});
+
+// Category Sales Chart
+var categorySalesChart = createChart('categorySalesChart', {
+    type: 'doughnut',
+    data: {
+        labels: dashboardData.sales_by_category.map(function(row) { return row[0]; }),
+        datasets: [{
+            data: dashboardData.sales_by_category.map(function(row) { return row[1]; }),
+            backgroundColor: [
+                '#4CAF50',
+                '#FF5722',
+                '#2196F3',
+                '#9C27B0',
+                '#FFC107'
+            ]
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: {
+                position: 'bottom'
+            }
+        }
+    }
+});
+
+// Top Products Chart
+var topProductsChart = createChart('topProductsChart', {
+    type: 'bar',
+    data: {
+        labels: dashboardData.top_products.map(function(row) { return row[0]; }),
+        datasets: [{
+            label: 'Units Sold',
+            data: dashboardData.top_products.map(function(row) { return row[1]; }),
+            backgroundColor: '#2196F3'
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true
+            }
+        }
+    }
+});
+
+// User Registration Trend Chart (simulated data)
+var userRegistrationChart = createChart('userRegistrationChart', {
+    type: 'line',
+    data: {
+        labels: ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        datasets: [{
+            label: 'New Users',
+            data: [5, 8, 12, 15, 10, 7, 9, 11, 14, 16, 18, 20],
+            backgroundColor: 'rgba(255, 87, 34, 0.2)',
+            borderColor: '#FF5722',
+            borderWidth: 2,
+            tension: 0.3
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true
+            }
+        }
+    }
+});
+
+// Modal functionality
+const modal = document.getElementById('addUserModal');
+const addUserBtn = document.getElementById('addUserBtn');
+const closeBtn = document.querySelector('.close');
+
+addUserBtn.onclick = function() {
+    modal.style.display = 'block';
+}
+
+closeBtn.onclick = function() {
+    modal.style.display = 'none';
+}
+
+window.onclick = function(event) {
+    if (event.target == modal) {
+        modal.style.display = 'none';
+    }
+}
+
+// Form submission
+document.getElementById('addUserForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    // Here you would send an AJAX request to add the user
+    alert('User added successfully!');
+    modal.style.display = 'none';
+    // Refresh the user list
+    location.reload();
+});
+
+// Users table: filtering and paging happen server-side through
+// /admin/api/users, one page of rows at a time
+const usersTable = document.getElementById('usersTable');
+const usersBody = usersTable.querySelector('tbody');
+const loadMoreButton = document.getElementById('loadMoreUsers');
+let usersFilter = {};
+
+function titleCase(text) {
+    return String(text).replace(/\w\S*/g, word => word.charAt(0).toUpperCase() + word.slice(1).toLowerCase());
+}
+
+function badge(className, text) {
+    const span = document.createElement('span');
+    span.className = className;
+    span.textContent = text;
+    return span;
+}
+
+function userCell(column, value) {
+    const td = document.createElement('td');
+    if (column === 'status') {
+        if (['active', 'inactive', 'suspended'].includes(value)) {
+            td.appendChild(badge('status status-' + value, titleCase(value)));
+        } else {
+            td.appendChild(badge('status', String(value)));
+        }
+    } else if (column === 'role') {
+        const known = ['customer', 'admin', 'vendor'].includes(value);
+        td.appendChild(badge('badge badge-' + (known ? value : 'support'), titleCase(value)));
+    } else {
+        td.textContent = value === null ? 'None' : value;
+    }
+    return td;
+}
+
+function actionButton(className, icon, tooltip, userId) {
+    const button = document.createElement('button');
+    button.className = 'button tooltip ' + className;
+    button.setAttribute('data-user-id', userId);
+    const i = document.createElement('i');
+    i.className = 'fas ' + icon;
+    button.appendChild(i);
+    button.appendChild(badge('tooltiptext', tooltip));
+    return button;
+}
+
+function userRow(columns, user) {
+    const tr = document.createElement('tr');
+    columns.forEach((column, i) => tr.appendChild(userCell(column, user[i])));
+    const card = document.createElement('td');
+    card.className = 'credit-card';
+    card.textContent = user.length >= 9 && user[8] ? user[8] : 'N/A';
+    tr.appendChild(card);
+    const actions = document.createElement('td');
+    actions.appendChild(actionButton('button-view', 'fa-eye', 'View Details', user[0]));
+    actions.appendChild(actionButton('button-edit', 'fa-edit', 'Edit User', user[0]));
+    actions.appendChild(actionButton('button-delete', 'fa-trash', 'Delete User', user[0]));
+    tr.appendChild(actions);
+    return tr;
+}
+
+function fetchUsers(after) {
+    const params = new URLSearchParams(usersFilter);
+    if (after) {
+        params.set('after', after);
+    }
+    loadMoreButton.disabled = true;
+    return fetch(usersTable.dataset.source + '?' + params)
+        .then(response => response.json())
+        .then(data => {
+            if (!after) {
+                usersBody.replaceChildren();
+            }
+            data.users.forEach(user => usersBody.appendChild(userRow(data.columns, user)));
+            loadMoreButton.dataset.next = data.next || '';
+            loadMoreButton.hidden = !data.next;
+        })
+        .finally(() => {
+            loadMoreButton.disabled = false;
+        });
+}
+
+function applyFilter() {
+    usersFilter = {};
+    const status = document.getElementById('statusFilter').value;
+    const role = document.getElementById('roleFilter').value;
+    const search = document.getElementById('searchInput').value.trim();
+    if (status) usersFilter.status = status;
+    if (role) usersFilter.role = role;
+    if (search) usersFilter.q = search;
+    fetchUsers(null);
+}
+
+document.querySelector('.button-filter').addEventListener('click', applyFilter);
+document.getElementById('searchInput').addEventListener('keydown', function(e) {
+    if (e.key === 'Enter') {
+        applyFilter();
+    }
+});
+
+loadMoreButton.addEventListener('click', function() {
+    fetchUsers(this.dataset.next);
+});
+
+// Action buttons functionality; delegated so rows loaded later work too
+usersBody.addEventListener('click', function(e) {
+    const button = e.target.closest('button[data-user-id]');
+    if (!button) {
+        return;
+    }
+    const userId = button.getAttribute('data-user-id');
+    if (button.classList.contains('button-view')) {
+        alert('Viewing user with ID: ' + userId);
+        // Here you would redirect to a user details page or show a modal
+    } else if (button.classList.contains('button-edit')) {
+        alert('Editing user with ID: ' + userId);
+        // Here you would redirect to a user edit page or show a modal
+    } else if (button.classList.contains('button-delete')) {
+        const userName = button.closest('tr').querySelector('td:nth-child(2)').textContent.trim();
+        if (confirm('Are you sure you want to delete user ' + userName + ' (ID: ' + userId + ')?')) {
+            alert('User deleted successfully!');
+            // Here you would send an AJAX request to delete the user
+            button.closest('tr').remove();
+        }
+    }
+});
@@ -0,0 +1,46 @@
+import hashlib
+import os
+import time
+from jinja2 import FileSystemBytecodeCache
+
+# Every page template rendered by index.py
+PAGE_TEMPLATES = (
+    'index.html',
+    'login.html',
+    'register.html',
+    'marketplace.html',
+    '_product_grid.html',
+    'search.html',
+    'admin_logs.html',
+    'admin_dashboard.html',
+)
+
+# Hash of all page template sources, set by init_app. Anything derived from
+# rendered pages (such as ETags) should include it so a template change is
+# never mistaken for unchanged content.
+digest = ''
+
+
+def init_app(app):
+    """Compile all page templates into the Jinja cache at startup.
+
+    If TEMPLATE_BYTECODE_CACHE names a directory, compiled templates are
+    also stored there so later processes skip compilation entirely.
+    Returns the compile time of each template in seconds.
+    """
+    cache_dir = app.config.get('TEMPLATE_BYTECODE_CACHE')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+    global digest
+    sources = hashlib.sha1()
+    timings = {}
+    for name in PAGE_TEMPLATES:
+        start = time.perf_counter()
+        app.jinja_env.get_template(name)
+        timings[name] = time.perf_counter() - start
+        source, _, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+        sources.update(source.encode())
+    digest = sources.hexdigest()[:12]
+    return timings